@@ -4,13 +4,27 @@ Browser-use lifecycle hooks for restaurant data extraction
 
 import json
 import os
+import time
 from pathlib import Path
 
+# Screenshot paths already confirmed on disk; hooks fire repeatedly for the same file
+_seen_screenshots = set()
+
+
+def _screenshot_exists(path: str) -> bool:
+    """os.path.exists, remembered once a screenshot has been seen"""
+    if path in _seen_screenshots:
+        return True
+    if os.path.exists(path):
+        _seen_screenshots.add(path)
+        return True
+    return False
+
 def on_page_load(page_url: str, screenshot_path: str = None):
     """Hook called when page loads - extract restaurant data from screenshot"""
     print(f"🔍 Page loaded: {page_url}")
     
-    if screenshot_path and os.path.exists(screenshot_path):
+    if screenshot_path and _screenshot_exists(screenshot_path):
         print(f"📸 Screenshot captured: {screenshot_path}")
         # Here we could analyze the screenshot with an LLM
         # For now, just log that we have it
@@ -32,10 +46,10 @@ def on_task_complete(final_result: str, screenshots: list = None):
     data = {
         "result": final_result,
         "screenshots": screenshots or [],
-        "timestamp": str(os.times())
+        "timestamp_ns": time.time_ns()
     }
     
-    with open(results_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # Compact output, serialized in memory and written in one call
+    results_file.write_text(json.dumps(data))
     
     print(f"💾 Results saved to {results_file}")
\ No newline at end of file
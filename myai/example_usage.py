@@ -7,7 +7,7 @@ Demonstrates how personal preferences drive restaurant selection
 import asyncio
 from src.myai.preferences import get_user_context, format_preferences_for_prompt
 from src.myai.evaluator import RestaurantInfo, RestaurantEvaluator
-from browser_use.llm import ChatGoogle
+from src.myai.cli_extractor import get_llm
 from src.myai.restaurant_finder import RestaurantFinder
 from src.myai.search_optimizer import ContextPriority
 from src.myai.date_parser import parse_date_query
@@ -87,8 +87,7 @@ def demonstrate_scoring():
     
     print("Evaluating 3 example restaurants:\n")
     
-    for restaurant in restaurants:
-        score = evaluator.evaluate_restaurant(restaurant)
+    for restaurant, score in zip(restaurants, evaluator.evaluate_batch(restaurants)):
         print(f"{restaurant.name}")
         print(f"  Score: {score.total_score}/100")
         print(f"  {score.explanation}")
@@ -100,9 +99,8 @@ async def demonstrate_browser_search():
     print("=== Browser Automation Demo ===\n")
     
     try:
-        llm = ChatGoogle(model='gemini-2.0-pro')
         context = get_user_context()
-        finder = RestaurantFinder(context, llm)
+        finder = RestaurantFinder(context, get_llm())
         
         print("This would normally:")
         print("1. Open a browser (headless mode)")
@@ -6,16 +6,15 @@ This shows how to use the MCP server instead of the browser-use Python agent
 
 import subprocess
 import json
-from datetime import datetime
 from src.myai.preferences import get_user_context
-from src.myai.date_parser import parse_date_query, parse_party_size, get_meal_time
+from src.myai.date_parser import parse_date_query, parse_party_size, get_meal_time, meal_clock
 
 def run_mcp_command(command: str) -> str:
     """Run a browser-use MCP command and return the result"""
     # This assumes you have browser-use MCP server running
     # You might need to adjust this based on your MCP setup
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
-    return result.stdout
+    result = subprocess.run(command, shell=True, capture_output=True)
+    return result.stdout.decode('utf-8', errors='replace')
 
 def find_restaurants_with_mcp(query: str = "dinner for 5 at 8pm"):
     """Find restaurants using browser-use MCP commands"""
@@ -26,12 +25,8 @@ def find_restaurants_with_mcp(query: str = "dinner for 5 at 8pm"):
     party_size = parse_party_size(query)
     meal_time = get_meal_time(query)
     
-    # Convert time to 24-hour format
-    try:
-        time_obj = datetime.strptime(meal_time, "%I:%M %p")
-        hour = time_obj.hour
-    except:
-        hour = 19  # Default to 7pm
+    # Convert time to 24-hour format (7pm if it can't be read)
+    hour, _ = meal_clock(meal_time)
     
     # Build OpenTable URL
     url = f"https://www.opentable.com/s?covers={party_size}&dateTime={date_obj.strftime(f'%Y-%m-%dT{hour:02d}:00')}&metroId=4&term=vegetarian&prices=2,3"
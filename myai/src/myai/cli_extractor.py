@@ -0,0 +1,219 @@
+"""
+In-process browser-use extraction
+
+Runs the browser-use Agent directly instead of shelling out to
+`poetry run browser-use`, so each query skips interpreter/Poetry startup
+and reuses the already-imported browser-use modules. Browser sessions
+are kept alive on a background event loop and reused across queries.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+from typing import List, Dict, Any
+from browser_use import Agent, BrowserProfile, BrowserSession
+from browser_use.llm import ChatGoogle
+from dotenv import load_dotenv
+try:
+    from .preferences import UserContext
+    from .query_analyzer import analyze_query, build_direct_url
+except ImportError:
+    from preferences import UserContext
+    from query_analyzer import analyze_query, build_direct_url
+
+# Pick up GOOGLE_API_KEY from .env once, at import
+load_dotenv()
+
+MODEL = os.getenv("MYAI_MODEL", "gemini-2.5-flash-lite-preview-06-17")
+
+# One pipe-delimited row per line, optional "1. " numbering stripped
+_ROW_RE = re.compile(r'^[ \t]*(?:\d+\.[ \t]*)?([^\n|]*\|[^\n]*)$', re.M)
+# Header/echo lines the agent sometimes emits instead of restaurants
+_SKIP_RE = re.compile(r'extracted|format|restaurant name|looking', re.I)
+
+# Prompt shared by the extraction scripts: plain numbered names
+LIST_PROMPT_TEMPLATE = """Go to {url}. Extract restaurant names you see. List them as:
+1. Restaurant Name
+2. Restaurant Name
+etc.
+
+Stop after listing what you see."""
+
+# Structured prompt used by extract_restaurants_cli
+RESTAURANT_PROMPT_TEMPLATE = """Go to {url}. Extract the restaurants you see.
+Output each restaurant as one JSON object per line, no prose:
+{{"name": "...", "cuisine": "...", "price": "$$", "address": "neighborhood"}}
+
+Stop after listing what you see."""
+
+_llm = None
+_agent_loop = None
+_browser_sessions: List[BrowserSession] = []
+_idle_browsers: List[BrowserSession] = []
+# Guards the loop and pool above; several platforms may extract from worker threads at once
+_pool_lock = threading.Lock()
+
+
+def get_llm() -> ChatGoogle:
+    """Shared LLM client, created on first use and reused by every agent"""
+    global _llm
+    if _llm is None:
+        _llm = ChatGoogle(model=MODEL)
+    return _llm
+
+
+def _get_agent_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop that owns the long-lived browser sessions"""
+    global _agent_loop
+    with _pool_lock:
+        if _agent_loop is None:
+            _agent_loop = asyncio.new_event_loop()
+            threading.Thread(target=_agent_loop.run_forever, name="browser-use", daemon=True).start()
+            atexit.register(_close_browsers)
+        return _agent_loop
+
+
+def _acquire_browser() -> BrowserSession:
+    """Reuse an idle browser session, or launch one if all are busy"""
+    with _pool_lock:
+        if _idle_browsers:
+            return _idle_browsers.pop()
+        
+        session = BrowserSession(browser_profile=BrowserProfile(headless=True, keep_alive=True))
+        _browser_sessions.append(session)
+        return session
+
+
+async def _kill_browsers():
+    with _pool_lock:
+        sessions = list(_browser_sessions)
+    for session in sessions:
+        try:
+            await session.kill()
+        except Exception:
+            pass
+
+
+async def _discard_browser(session: BrowserSession):
+    """Kill a session that timed out or failed; it may be mid-navigation or crashed"""
+    with _pool_lock:
+        _browser_sessions[:] = [s for s in _browser_sessions if s is not session]
+    try:
+        await session.kill()
+    except Exception:
+        pass
+
+
+def _close_browsers():
+    """Shut down every browser session at interpreter exit"""
+    if _browser_sessions:
+        asyncio.run_coroutine_threadsafe(_kill_browsers(), _agent_loop).result(timeout=10)
+
+
+async def _run_agent(prompt: str, timeout: float) -> str:
+    """Run one agent on a pooled browser session (agent loop only)"""
+    session = _acquire_browser()
+    try:
+        agent = Agent(task=prompt, llm=get_llm(), browser_session=session)
+        history = await asyncio.wait_for(agent.run(), timeout=timeout)
+        result = history.final_result() or ""
+    except asyncio.TimeoutError:
+        print(f"⏱️ Agent timed out after {timeout:.0f}s")
+        await _discard_browser(session)
+        return ""
+    except BaseException:
+        await _discard_browser(session)
+        raise
+    
+    # Only a session that finished cleanly goes back to the pool
+    with _pool_lock:
+        _idle_browsers.append(session)
+    return result
+
+
+async def extract_with_cli(prompt: str, timeout: float = 60.0) -> str:
+    """Run a browser-use agent in-process and return its final result text"""
+    future = asyncio.run_coroutine_threadsafe(_run_agent(prompt, timeout), _get_agent_loop())
+    return await asyncio.wrap_future(future)
+
+
+def run_agent_sync(prompt: str, timeout: float = 60.0) -> str:
+    """Blocking variant of extract_with_cli for synchronous callers (not from the agent loop)"""
+    future = asyncio.run_coroutine_threadsafe(_run_agent(prompt, timeout), _get_agent_loop())
+    return future.result()
+
+
+def build_prompt(url: str, template: str = LIST_PROMPT_TEMPLATE) -> str:
+    """Fill an extraction prompt template for the given search URL"""
+    return template.format(url=url)
+
+
+async def extract_restaurants_cli(platform: str, query: str, context: UserContext) -> List[Dict[str, Any]]:
+    """Extract restaurants for a platform/query and parse them into dicts"""
+    params = analyze_query(query, context)
+    url = build_direct_url(platform, params)
+    if not url:
+        return []
+
+    prompt = build_prompt(url, RESTAURANT_PROMPT_TEMPLATE)
+    output = await extract_with_cli(prompt)
+    return parse_cli_results(output)
+
+
+async def extract_many(queries: List[str], platform: str, context: UserContext, max_concurrency: int = 4) -> List[List[Dict[str, Any]]]:
+    """Extract several queries concurrently, at most max_concurrency browsers at a time"""
+    sem = asyncio.Semaphore(max_concurrency)
+    
+    async def _one(query: str) -> List[Dict[str, Any]]:
+        async with sem:
+            return await extract_restaurants_cli(platform, query, context)
+    
+    return await asyncio.gather(*[_one(q) for q in queries])
+
+
+def parse_cli_results(output: str) -> List[Dict[str, Any]]:
+    """Parse one-JSON-object-per-line agent output into restaurant dicts"""
+    restaurants = []
+
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith('{'):
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(item, dict) and item.get('name'):
+            restaurants.append({
+                'name': str(item['name']).strip(),
+                'cuisine': item.get('cuisine') or '',
+                'price': item.get('price') or '$$',
+                'address': item.get('address') or ''
+            })
+
+    # The model doesn't always follow the JSON instruction; fall back to pipe rows
+    return restaurants or _parse_pipe_rows(output)
+
+
+def _parse_pipe_rows(output: str) -> List[Dict[str, Any]]:
+    """Parse 'Name | Cuisine | Price | Neighborhood' lines into restaurant dicts"""
+    restaurants = []
+
+    for match in _ROW_RE.finditer(output):
+        parts = [p.strip() for p in match.group(1).split('|')]
+        name = parts[0]
+
+        if not name or _SKIP_RE.search(name):
+            continue
+
+        restaurants.append({
+            'name': name,
+            'cuisine': parts[1] if len(parts) > 1 else '',
+            'price': parts[2] if len(parts) > 2 else '$$',
+            'address': parts[3] if len(parts) > 3 else ''
+        })
+
+    return restaurants
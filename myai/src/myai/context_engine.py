@@ -7,10 +7,12 @@ This module provides a unified system for:
 3. Providing context to various AI models (MCP servers, direct calls, etc.)
 """
 
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional, Set
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, List, Any, Optional, Set, Tuple, FrozenSet
 import re
-from datetime import datetime
+import time
+from datetime import datetime, date, timedelta
+from functools import lru_cache
 import json
 
 # ============================================================================
@@ -52,7 +54,175 @@ PERSONAL_CONTEXT = {
     }
 }
 
-@dataclass
+# Single pass over the query for party size plus the meal/intent/date keywords.
+# "table for N" needs no branch of its own - "for N" already captures it.
+# Meal and intent words may be inflected ("booking", "lunches"); the bare stem is
+# captured. Date words must match whole, as in date_parser.
+_QUERY_SCAN_RE = re.compile(
+    r'for (?P<for_n>\d+)(?P<people> people)?'
+    r'|party of (?P<party_of>\d+)'
+    r'|(?P<n_people>\d+) people'
+    r'|\b(?:(?P<stem>breakfast|brunch|lunch|dinner|tonight|find|search|recommend|book|reserve|table)'
+    r'(?:s|es|ing|ed|d)?'
+    r'|(?P<word>today|tomorrow|next week|monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b'
+)
+
+# Scanned word -> (field, value) for the meal/intent extractors
+_TOKEN_MAP = {
+    'breakfast': ('meal', 'breakfast'), 'brunch': ('meal', 'breakfast'),
+    'lunch': ('meal', 'lunch'),
+    'dinner': ('meal', 'dinner'), 'tonight': ('meal', 'dinner'),
+    'find': ('intent', 'find_restaurants'), 'search': ('intent', 'find_restaurants'),
+    'recommend': ('intent', 'find_restaurants'),
+    'book': ('intent', 'make_reservation'), 'reserve': ('intent', 'make_reservation'),
+    'table': ('intent', 'make_reservation'),
+}
+# When a query names several, the lower rank wins (same order as the old if/elif chains)
+_TOKEN_RANK = {'breakfast': 0, 'lunch': 1, 'dinner': 2, 'find_restaurants': 0, 'make_reservation': 1}
+
+_WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+
+_TIME_PATTERNS = [re.compile(p) for p in (
+    r'(\d{1,2}):(\d{2})\s*(am|pm)',
+    r'(\d{1,2})\s*(am|pm)'
+)]
+
+# Keyword mappings for context relevance detection
+_CONTEXT_KEYWORDS = {
+    'dietary': frozenset({
+        'vegetarian', 'vegan', 'allergy', 'allergic', 'spicy', 'mild', 
+        'meat', 'dairy', 'gluten', 'diet', 'dietary'
+    }),
+    'cuisine': frozenset({
+        'asian', 'mexican', 'thai', 'chinese', 'indian', 'italian', 
+        'japanese', 'vietnamese', 'cuisine', 'food', 'restaurant'
+    }),
+    'budget': frozenset({
+        'cheap', 'expensive', 'budget', 'price', 'cost', 'affordable',
+        '$', '$$', '$$$', 'money', 'spend'
+    }),
+    'location': frozenset({
+        'near', 'close', 'distance', 'neighborhood', 'area', 'transit',
+        'walk', 'drive', 'uber', 'bart', 'muni'
+    }),
+    'timing': frozenset({
+        'time', 'when', 'available', 'reservation', 'book', 'table',
+        'tonight', 'tomorrow', 'weekend', 'lunch', 'dinner', 'breakfast'
+    })
+}
+
+
+def _keyword_weights(context_keywords: Dict[str, FrozenSet[str]]) -> List[float]:
+    """Per-category 1/len (in category order), so relevance is hits * weight"""
+    return [1.0 / len(v) for v in context_keywords.values()]
+
+
+def _build_keyword_matcher(context_keywords: Dict[str, FrozenSet[str]]):
+    """
+    Compile every context keyword into one regex for a single scan of the query.
+    The lookahead reports the longest keyword starting at each position; the
+    expansion table adds the shorter keywords it contains ('$$$' -> '$$', '$'),
+    so the hit set is identical to testing each keyword with `in`.
+    """
+    keywords = sorted({kw for kws in context_keywords.values() for kw in kws}, key=len, reverse=True)
+    if not keywords:
+        return None, {}, {}
+    
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+    contained = {kw: [other for other in keywords if other in kw] for kw in keywords}
+    # Categories as integer ids (position in context_keywords) so scoring counts into a flat list
+    category_ids = {kw: tuple(i for i, kws in enumerate(context_keywords.values()) if kw in kws)
+                    for kw in keywords}
+    return pattern, contained, category_ids
+
+
+# Line/value grammar for the docstring-style personal context
+_SECTION_RE = re.compile(r'## (.*)')
+_KV_RE = re.compile(r'(?:- )?([^:]*):(.*)')
+_NUMBER_RE = re.compile(r'[0-9]+\.?[0-9]*|\.[0-9]+')
+
+
+def _parse_list(value: str):
+    if value.endswith(']'):
+        return [item.strip().strip('"') for item in value[1:-1].split(',') if item.strip()]
+    return value
+
+
+def _parse_quoted(value: str):
+    return value[1:-1] if value.endswith('"') else value
+
+
+def _parse_bool(value: str):
+    lowered = value.lower()
+    if lowered == 'true' or lowered == 'false':
+        return lowered == 'true'
+    return value
+
+
+# Value parser chosen by the value's first character
+_VALUE_PARSERS = {
+    '[': _parse_list,
+    '"': _parse_quoted,
+    't': _parse_bool, 'T': _parse_bool,
+    'f': _parse_bool, 'F': _parse_bool,
+}
+
+
+def _parse_value(value: str):
+    """Convert a raw value to list/str/bool/number; anything else stays a string"""
+    parser = _VALUE_PARSERS.get(value[:1])
+    if parser:
+        return parser(value)
+    if _NUMBER_RE.fullmatch(value):
+        return float(value) if '.' in value else int(value)
+    return value
+
+
+@lru_cache(maxsize=8)
+def _parse_personal_context(context_text: str) -> Dict[str, Any]:
+    """
+    Parse the docstring-style personal context into structured data
+    Parsed once per distinct text; engines share the result, so don't mutate it
+    """
+    # Pre-baked JSON (e.g. exported via to_mcp_format) skips the line parser
+    if context_text.lstrip().startswith('{'):
+        return json.loads(context_text)
+    
+    data = {}
+    section = None
+    
+    for line in context_text.split('\n'):
+        line = line.strip()
+        # Skip blanks and single # comments (## are section headers)
+        if not line or (line[0] == '#' and not line.startswith('##')):
+            continue
+        
+        match = _SECTION_RE.match(line)
+        if match:
+            section = data[match.group(1).lower().replace(' ', '_').replace('&', '_')] = {}
+            continue
+        
+        if section is not None:
+            match = _KV_RE.match(line)
+            if match:
+                section[match.group(1).strip()] = _parse_value(match.group(2).strip())
+    
+    return data
+
+
+_DEFAULT_KEYWORD_WEIGHTS = _keyword_weights(_CONTEXT_KEYWORDS)
+
+_DEFAULT_KEYWORD_MATCHER = _build_keyword_matcher(_CONTEXT_KEYWORDS)
+
+
+# Shared empty slice for categories that aren't relevant - read-only, never mutate
+_NO_CONTEXT: Dict[str, Any] = {}
+
+
+@dataclass(slots=True)
 class ContextualRequest:
     """Represents a parsed user request with relevant context"""
     
@@ -83,110 +253,65 @@ class ContextEngine:
     def __init__(self, personal_context: Dict[str, Any] = None):
         if personal_context is None:
             personal_context = PERSONAL_CONTEXT
-        self.personal_data = personal_context if isinstance(personal_context, dict) else self._parse_personal_context(personal_context)
+        self.personal_data = personal_context if isinstance(personal_context, dict) else _parse_personal_context(personal_context)
         self.context_keywords = self._build_context_keywords()
+        self._keyword_matcher = None  # None -> the shared _DEFAULT_KEYWORD_MATCHER
+        self._keyword_weights = _DEFAULT_KEYWORD_WEIGHTS
+        # Per-instance so from_mcp_data can invalidate it
+        self._analyze_cached = lru_cache(maxsize=512)(self._analyze_for_day)
+        self._timestamp_cache = (float('-inf'), '')
+        # Bumped by from_mcp_data; keys the serialized MCP payload cache
+        self._context_version = 0
+        self._mcp_bytes_cache = (None, b'')
     
-    def _parse_personal_context(self, context_text: str) -> Dict[str, Any]:
-        """Parse the docstring-style personal context into structured data"""
-        
-        data = {}
-        current_section = None
-        
-        for line in context_text.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            # Skip only single # comments, not section headers ##
-            if line.startswith('#') and not line.startswith('##'):
-                continue
-                
-            # Section headers
-            if line.startswith('## '):
-                current_section = line[3:].lower().replace(' ', '_').replace('&', '_')
-                data[current_section] = {}
-                continue
-            
-            # Parse key-value pairs
-            if ':' in line and current_section:
-                if line.startswith('- '):
-                    line = line[2:]
-                
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Parse different value types
-                if value.startswith('[') and value.endswith(']'):
-                    # List
-                    value = [item.strip().strip('"') for item in value[1:-1].split(',') if item.strip()]
-                elif value.startswith('"') and value.endswith('"'):
-                    # String
-                    value = value[1:-1]
-                elif value.lower() in ['true', 'false']:
-                    # Boolean
-                    value = value.lower() == 'true'
-                elif value.replace('.', '').isdigit():
-                    # Number
-                    value = float(value) if '.' in value else int(value)
-                
-                data[current_section][key] = value
-        
-        return data
-    
-    def _build_context_keywords(self) -> Dict[str, Set[str]]:
-        """Build keyword mappings for context relevance detection"""
-        
-        return {
-            'dietary': {
-                'vegetarian', 'vegan', 'allergy', 'allergic', 'spicy', 'mild', 
-                'meat', 'dairy', 'gluten', 'diet', 'dietary'
-            },
-            'cuisine': {
-                'asian', 'mexican', 'thai', 'chinese', 'indian', 'italian', 
-                'japanese', 'vietnamese', 'cuisine', 'food', 'restaurant'
-            },
-            'budget': {
-                'cheap', 'expensive', 'budget', 'price', 'cost', 'affordable',
-                '$', '$$', '$$$', 'money', 'spend'
-            },
-            'location': {
-                'near', 'close', 'distance', 'neighborhood', 'area', 'transit',
-                'walk', 'drive', 'uber', 'bart', 'muni'
-            },
-            'timing': {
-                'time', 'when', 'available', 'reservation', 'book', 'table',
-                'tonight', 'tomorrow', 'weekend', 'lunch', 'dinner', 'breakfast'
-            }
-        }
+    def _build_context_keywords(self) -> Dict[str, FrozenSet[str]]:
+        """Keyword mappings for context relevance detection (shared, immutable)"""
+        return _CONTEXT_KEYWORDS
     
     def analyze_request(self, query: str) -> ContextualRequest:
-        """Analyze a user request and determine what personal context is relevant"""
-        
-        query_lower = query.lower()
+        """
+        Analyze a user request and determine what personal context is relevant
+        Parsing is cached per normalized query (and day, since dates are relative)
+        """
+        cached = self._analyze_cached(query.strip().lower(), date.today())
+        # Each caller gets its own dicts, so mutating one can't leak into later cache hits
+        return replace(
+            cached,
+            original_query=query,
+            dietary_context=dict(cached.dietary_context),
+            cuisine_context=dict(cached.cuisine_context),
+            budget_context=dict(cached.budget_context),
+            location_context=dict(cached.location_context),
+            timing_context=dict(cached.timing_context),
+            context_relevance=dict(cached.context_relevance),
+        )
+    
+    def _analyze_for_day(self, query_lower: str, day: date) -> ContextualRequest:
+        # query_lower is already stripped and lowered; every extractor works on it
         
-        # Extract basic parameters
-        party_size = self._extract_party_size(query)
-        date_info = self._extract_date(query)
-        time_info = self._extract_time(query)
-        meal_type = self._extract_meal_type(query)
-        intent = self._extract_intent(query)
+        # Extract basic parameters (one scan feeds all keyword-based extractors)
+        party_hit, words = self._scan_query(query_lower)
+        party_size = self._extract_party_size(party_hit)
+        date_info = self._extract_date(words, datetime.now())
+        time_info = self._extract_time(query_lower)
+        tokens = self._resolve_tokens(words)
+        meal_type = self._extract_meal_type(tokens)
+        intent = self._extract_intent(tokens)
         
         # Determine context relevance
-        relevance = {}
-        for context_type, keywords in self.context_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in query_lower) / len(keywords)
-            relevance[context_type] = score
+        relevance = self._score_relevance(query_lower)
         
-        # Build relevant context data
-        dietary_context = self.personal_data.get('dietary_requirements', {}) if relevance['dietary'] > 0.1 else {}
+        # Build relevant context data (slices are shared with personal_data, not copied)
+        data = self.personal_data
+        dietary_context = data.get('dietary_requirements', _NO_CONTEXT) if relevance['dietary'] > 0.1 else _NO_CONTEXT
         # Always include cuisine preferences as defaults for restaurant searches
-        cuisine_context = self.personal_data.get('cuisine_preferences', {})
-        budget_context = self.personal_data.get('budget_pricing', {}) if relevance['budget'] > 0.1 else {}
-        location_context = self.personal_data.get('location_transit', {}) if relevance['location'] > 0.1 else {}
-        timing_context = self.personal_data.get('availability_preferences', {}) if relevance['timing'] > 0.1 else {}
+        cuisine_context = data.get('cuisine_preferences', _NO_CONTEXT)
+        budget_context = data.get('budget_pricing', _NO_CONTEXT) if relevance['budget'] > 0.1 else _NO_CONTEXT
+        location_context = data.get('location_transit', _NO_CONTEXT) if relevance['location'] > 0.1 else _NO_CONTEXT
+        timing_context = data.get('availability_preferences', _NO_CONTEXT) if relevance['timing'] > 0.1 else _NO_CONTEXT
         
         return ContextualRequest(
-            original_query=query,
+            original_query=query_lower,  # replaced with the caller's text by analyze_request
             intent=intent,
             party_size=party_size,
             date=date_info,
@@ -200,45 +325,69 @@ class ContextEngine:
             context_relevance=relevance
         )
     
-    def _extract_party_size(self, query: str) -> int:
-        """Extract party size from query"""
-        patterns = [
-            r'for (\d+) people',
-            r'for (\d+)',
-            r'party of (\d+)',
-            r'table for (\d+)',
-            r'(\d+) people'
-        ]
+    def _score_relevance(self, query_lower: str) -> Dict[str, float]:
+        """Fraction of each category's keywords present in the query"""
+        pattern, contained, category_ids = self._keyword_matcher or _DEFAULT_KEYWORD_MATCHER
+        weights = self._keyword_weights
         
-        for pattern in patterns:
-            match = re.search(pattern, query.lower())
-            if match:
-                return int(match.group(1))
+        found = set()
+        if pattern is not None:
+            for match in pattern.finditer(query_lower):
+                found.update(contained[match.group(1)])
         
-        return self.personal_data.get('dining_preferences', {}).get('party_size_typical', 2)
+        counts = [0] * len(weights)
+        for keyword in found:
+            for idx in category_ids[keyword]:
+                counts[idx] += 1
+        
+        return {context_type: counts[idx] * weights[idx]
+                for idx, context_type in enumerate(self.context_keywords)}
     
-    def _extract_date(self, query: str) -> Optional[datetime]:
-        """Extract date from query with better parsing"""
-        from datetime import timedelta
+    def _scan_query(self, query_lower: str) -> Tuple[Optional[int], Set[str]]:
+        """Find the party size and all meal/intent/date keywords in one pass"""
+        for_people = for_any = party_of = n_people = None
+        words = set()
+        
+        for match in _QUERY_SCAN_RE.finditer(query_lower):
+            word = match.group('stem') or match.group('word')
+            if word:
+                words.add(word)
+            elif match.group('for_n'):
+                if for_people is None and match.group('people'):
+                    for_people = match.group('for_n')
+                if for_any is None:
+                    for_any = match.group('for_n')
+            elif match.group('party_of'):
+                if party_of is None:
+                    party_of = match.group('party_of')
+            elif n_people is None:
+                n_people = match.group('n_people')
         
-        query_lower = query.lower()
-        today = datetime.now()
+        # Same precedence as the old pattern list: "for N people" > "for N" > "party of N" > "N people"
+        for hit in (for_people, for_any, party_of, n_people):
+            if hit is not None:
+                return int(hit), words
+        return None, words
+    
+    def _extract_party_size(self, party_hit: Optional[int]) -> int:
+        """Party size from the scan, or the typical party size"""
+        if party_hit is not None:
+            return party_hit
         
-        if 'tomorrow' in query_lower:
+        return self.personal_data.get('dining_preferences', {}).get('party_size_typical', 2)
+    
+    def _extract_date(self, words: Set[str], today: datetime) -> Optional[datetime]:
+        """Extract date from the scanned keywords, relative to the request's 'now'"""
+        if 'tomorrow' in words:
             return today + timedelta(days=1)
-        elif 'tonight' in query_lower or 'today' in query_lower:
+        elif 'tonight' in words or 'today' in words:
             return today
-        elif 'next week' in query_lower:
+        elif 'next week' in words:
             return today + timedelta(days=7)
         else:
             # Check for day names
-            days = {
-                "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-                "friday": 4, "saturday": 5, "sunday": 6
-            }
-            
-            for day_name, day_num in days.items():
-                if day_name in query_lower:
+            for day_name, day_num in _WEEKDAYS.items():
+                if day_name in words:
                     days_ahead = (day_num - today.weekday()) % 7
                     if days_ahead == 0:
                         days_ahead = 7  # Next week's day
@@ -246,39 +395,34 @@ class ContextEngine:
         
         return None
     
-    def _extract_time(self, query: str) -> Optional[str]:
-        """Extract time from query"""
-        time_patterns = [
-            r'(\d{1,2}):(\\d{2})\\s*(am|pm)',
-            r'(\d{1,2})\\s*(am|pm)'
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, query.lower())
+    def _extract_time(self, query_lower: str) -> Optional[str]:
+        """Extract time from the lowercased query"""
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(query_lower)
             if match:
                 return match.group(0)
         
         return None
     
-    def _extract_meal_type(self, query: str) -> str:
-        """Extract meal type from query"""
-        query_lower = query.lower()
-        if any(word in query_lower for word in ['breakfast', 'brunch']):
-            return 'breakfast'
-        elif 'lunch' in query_lower:
-            return 'lunch'
-        elif any(word in query_lower for word in ['dinner', 'tonight']):
-            return 'dinner'
-        return 'dinner'  # default
+    def _resolve_tokens(self, words: Set[str]) -> Dict[str, str]:
+        """Map scanned keywords to meal/intent values via _TOKEN_MAP"""
+        resolved = {}
+        for word in words:
+            hit = _TOKEN_MAP.get(word)
+            if hit:
+                field, value = hit
+                current = resolved.get(field)
+                if current is None or _TOKEN_RANK[value] < _TOKEN_RANK[current]:
+                    resolved[field] = value
+        return resolved
+    
+    def _extract_meal_type(self, tokens: Dict[str, str]) -> str:
+        """Extract meal type from the resolved keywords"""
+        return tokens.get('meal', 'dinner')  # default dinner
     
-    def _extract_intent(self, query: str) -> str:
-        """Extract user intent from query"""
-        query_lower = query.lower()
-        if any(word in query_lower for word in ['find', 'search', 'recommend']):
-            return 'find_restaurants'
-        elif any(word in query_lower for word in ['book', 'reserve', 'table']):
-            return 'make_reservation'
-        return 'find_restaurants'  # default
+    def _extract_intent(self, tokens: Dict[str, str]) -> str:
+        """Extract user intent from the resolved keywords"""
+        return tokens.get('intent', 'find_restaurants')  # default
     
     def build_search_context(self, request: ContextualRequest) -> Dict[str, Any]:
         """Build optimized search context for restaurant finding"""
@@ -312,15 +456,40 @@ class ContextEngine:
         return {
             'personal_context': self.personal_data,
             'context_keywords': {k: list(v) for k, v in self.context_keywords.items()},
-            'last_updated': datetime.now().isoformat()
+            'last_updated': self._now_iso()
         }
     
+    def to_mcp_bytes(self) -> bytes:
+        """
+        to_mcp_format serialized as UTF-8 JSON, for MCP responses
+        Re-encoded only when the context changes or the timestamp ticks over
+        """
+        key = (self._context_version, self._now_iso())
+        cached_key, payload = self._mcp_bytes_cache
+        if cached_key != key:
+            payload = json.dumps(self.to_mcp_format(), separators=(',', ':')).encode('utf-8')
+            self._mcp_bytes_cache = (key, payload)
+        return payload
+    
+    def _now_iso(self) -> str:
+        """Current time as ISO string, reused for up to a second between MCP polls"""
+        checked_at, iso = self._timestamp_cache
+        now = time.monotonic()
+        if now - checked_at >= 1.0:
+            iso = datetime.now().isoformat()
+            self._timestamp_cache = (now, iso)
+        return iso
+    
     def from_mcp_data(self, mcp_data: Dict[str, Any]) -> None:
         """Load personal context from MCP server data"""
+        self._analyze_cached.cache_clear()
+        self._context_version += 1
         if 'personal_context' in mcp_data:
             self.personal_data = mcp_data['personal_context']
         if 'context_keywords' in mcp_data:
-            self.context_keywords = {k: set(v) for k, v in mcp_data['context_keywords'].items()}
+            self.context_keywords = {k: frozenset(v) for k, v in mcp_data['context_keywords'].items()}
+            self._keyword_matcher = _build_keyword_matcher(self.context_keywords)
+            self._keyword_weights = _keyword_weights(self.context_keywords)
 
 
 # Global instance - can be replaced with MCP server data
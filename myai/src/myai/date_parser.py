@@ -2,107 +2,132 @@
 Date parsing utilities for restaurant searches
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Tuple
 import re
 
+# Compiled once at import; checked in priority order
+_PARTY_PATTERNS = [re.compile(p) for p in (
+    r'for (\d+) people',
+    r'for (\d+) person',
+    r'for (\d+)',  # Just "for X" without people
+    r'party of (\d+)',
+    r'table for (\d+)',
+    r'(\d+) people',
+    r'(\d+) person',
+)]
 
+_PARTY_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4,
+    'five': 5, 'six': 6, 'seven': 7, 'eight': 8
+}
+_PARTY_WORD_RE = re.compile(r'\b(' + '|'.join(_PARTY_WORDS) + r')\b')
+
+_TIME_PATTERNS = [re.compile(p) for p in (
+    r'(\d{1,2}):(\d{2})\s*(am|pm)',  # 7:30pm
+    r'(\d{1,2})\s*(am|pm)',           # 8pm
+)]
+
+# Relative phrases; "day after tomorrow" is listed first so it isn't read as "tomorrow"
+_REL_RE = re.compile(r'\b(tonight|today|day after tomorrow|tomorrow|this weekend|next week)\b')
+_DAY_RE = re.compile(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b')
+_DAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+
+# Meal word -> (precedence, default time); breakfast beats lunch beats dinner
+_MEAL_TIMES = {
+    "breakfast": (0, "10:00 AM"), "brunch": (0, "10:00 AM"),
+    "lunch": (1, "12:30 PM"),
+    "dinner": (2, "7:00 PM"), "tonight": (2, "7:00 PM"),
+}
+# Inflected forms ("lunches", "dinners") count as the meal word
+_MEAL_WORD_RE = re.compile(r'\b(' + '|'.join(_MEAL_TIMES) + r')(?:s|es)?\b')
+
+# "7:30 PM" as produced by get_meal_time (same shape strptime's "%I:%M %p" accepts)
+_CLOCK_RE = re.compile(r'(\d{1,2}):(\d{1,2})\s+(am|pm)', re.I)
+
+# _WEEKDAY_OFFSETS[today][target] = days until the next target weekday (same day -> next week)
+_WEEKDAY_OFFSETS = [[(target - today) % 7 or 7 for target in range(7)] for today in range(7)]
+
+
+class DateResult(NamedTuple):
+    """Parsed date plus its display label; unpacks like the old (date, str) tuple"""
+    date: datetime
+    label: str
+
+
+@lru_cache(maxsize=512)
 def parse_party_size(query: str) -> int:
     """Extract party size from query"""
     query_lower = query.lower()
     
     # Look for explicit numbers
-    patterns = [
-        r'for (\d+) people',
-        r'for (\d+) person',
-        r'for (\d+)',  # Just "for X" without people
-        r'party of (\d+)',
-        r'table for (\d+)',
-        r'(\d+) people',
-        r'(\d+) person',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, query_lower)
+    for pattern in _PARTY_PATTERNS:
+        match = pattern.search(query_lower)
         if match:
             return int(match.group(1))
     
     # Look for word numbers
-    word_to_num = {
-        'one': 1, 'two': 2, 'three': 3, 'four': 4,
-        'five': 5, 'six': 6, 'seven': 7, 'eight': 8
-    }
-    
-    for word, num in word_to_num.items():
-        if word in query_lower:
-            return num
+    match = _PARTY_WORD_RE.search(query_lower)
+    if match:
+        return _PARTY_WORDS[match.group(1)]
     
     # Default to 2 people
     return 2
 
 
-def parse_date_query(query: str) -> tuple[datetime, str]:
+def parse_date_query(query: str) -> DateResult:
     """
     Parse natural language date from query
-    Returns: (date_object, formatted_date_string)
+    Returns: DateResult(date_object, formatted_date_string)
     """
-    today = datetime.now()
+    now = datetime.now()
+    days, date_str = _resolve_date(query, now.date())
+    return DateResult(now + timedelta(days=days), date_str)
+
+
+@lru_cache(maxsize=512)
+def _resolve_date(query: str, today: date) -> Tuple[int, str]:
+    """Days ahead of today and the display label; keyed on today so labels roll over at midnight"""
+    offsets = _WEEKDAY_OFFSETS[today.weekday()]
     query_lower = query.lower()
     
+    relative = set(_REL_RE.findall(query_lower))
+    
     # Check for specific date patterns
-    if "tonight" in query_lower or "today" in query_lower:
-        date = today
-        date_str = "Today"
-    elif "tomorrow" in query_lower:
-        date = today + timedelta(days=1)
-        date_str = "Tomorrow"
-    elif "day after tomorrow" in query_lower:
-        date = today + timedelta(days=2)
-        date_str = date.strftime("%A, %B %d")
-    elif "this weekend" in query_lower:
+    if "tonight" in relative or "today" in relative:
+        return 0, "Today"
+    elif "tomorrow" in relative:
+        return 1, "Tomorrow"
+    elif "day after tomorrow" in relative:
+        days = 2
+    elif "this weekend" in relative:
         # Get next Saturday
-        days_until_saturday = (5 - today.weekday()) % 7
-        if days_until_saturday == 0:
-            days_until_saturday = 7
-        date = today + timedelta(days=days_until_saturday)
-        date_str = date.strftime("%A, %B %d")
-    elif "next week" in query_lower:
-        date = today + timedelta(days=7)
-        date_str = date.strftime("%A, %B %d")
+        days = offsets[5]
+    elif "next week" in relative:
+        days = 7
     else:
         # Check for day names
-        days = {
-            "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-            "friday": 4, "saturday": 5, "sunday": 6
-        }
-        
-        for day_name, day_num in days.items():
-            if day_name in query_lower:
-                days_ahead = (day_num - today.weekday()) % 7
-                if days_ahead == 0:
-                    days_ahead = 7  # Next week's day
-                date = today + timedelta(days=days_ahead)
-                date_str = date.strftime("%A, %B %d")
-                break
-        else:
+        match = _DAY_RE.search(query_lower)
+        if not match:
             # Default to today
-            date = today
-            date_str = "Today"
+            return 0, "Today"
+        days = offsets[_DAYS[match.group(1)]]
     
-    return date, date_str
+    return days, (today + timedelta(days=days)).strftime("%A, %B %d")
 
 
+@lru_cache(maxsize=512)
 def get_meal_time(query: str) -> str:
     """Extract meal time from query"""
     query_lower = query.lower()
     
     # Check for explicit time patterns like "8pm", "7:30pm", etc.
-    time_patterns = [
-        r'(\d{1,2}):(\d{2})\s*(am|pm)',  # 7:30pm
-        r'(\d{1,2})\s*(am|pm)',           # 8pm
-    ]
-    
-    for pattern in time_patterns:
-        match = re.search(pattern, query_lower)
+    for pattern in _TIME_PATTERNS:
+        match = pattern.search(query_lower)
         if match:
             if len(match.groups()) == 3:  # Format: 7:30pm
                 hour, minute, period = match.groups()
@@ -111,12 +136,17 @@ def get_meal_time(query: str) -> str:
                 hour, period = match.groups()
                 return f"{hour}:00 {period.upper()}"
     
-    # Fall back to meal-based defaults
-    if any(word in query_lower for word in ["breakfast", "brunch"]):
-        return "10:00 AM"
-    elif any(word in query_lower for word in ["lunch"]):
-        return "12:30 PM"
-    elif any(word in query_lower for word in ["dinner", "tonight"]):
-        return "7:00 PM"
-    else:
-        return "7:00 PM"  # Default to dinner
\ No newline at end of file
+    # Fall back to meal-based defaults (earliest-ranked meal wins)
+    hits = [_MEAL_TIMES[word] for word in _MEAL_WORD_RE.findall(query_lower)]
+    return min(hits)[1] if hits else "7:00 PM"  # Default to dinner
+
+
+@lru_cache(maxsize=64)
+def meal_clock(meal_time: str) -> Tuple[int, int]:
+    """24-hour (hour, minute) for a "7:30 PM" meal time; 7 PM if it can't be read"""
+    match = _CLOCK_RE.fullmatch(meal_time.strip()) if isinstance(meal_time, str) else None
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if 1 <= hour <= 12 and minute <= 59:
+            return hour % 12 + (12 if match.group(3).lower() == 'pm' else 0), minute
+    return 19, 0
\ No newline at end of file
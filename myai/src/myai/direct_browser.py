@@ -36,28 +36,31 @@ async def extract_restaurants_directly(url: str, llm) -> List[Dict[str, Any]]:
             '[role="article"]'
         ]
         
-        for selector in selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                if elements and len(elements) > 0:
-                    for i, element in enumerate(elements[:10]):  # Get up to 10
-                        try:
-                            text = await element.inner_text()
-                            if text and len(text) > 20:  # Filter out empty/small elements
-                                restaurants.append({
-                                    'raw_text': text,
-                                    'index': i
-                                })
-                        except:
-                            continue
-                    if restaurants:
-                        break
-            except:
+        # Probe every selector in one round of concurrent queries; the DOM is settled by now
+        probes = await asyncio.gather(
+            *[page.query_selector_all(selector) for selector in selectors],
+            return_exceptions=True
+        )
+        
+        # First selector (in priority order) whose elements yield usable text wins
+        for elements in probes:
+            if isinstance(elements, BaseException) or not elements:
                 continue
+            texts = await asyncio.gather(
+                *[element.inner_text() for element in elements[:10]],  # Get up to 10
+                return_exceptions=True
+            )
+            for i, text in enumerate(texts):
+                if isinstance(text, str) and len(text) > 20:  # Filter out empty/small/failed elements
+                    restaurants.append({
+                        'raw_text': text,
+                        'index': i
+                    })
+            if restaurants:
+                break
         
         # If no cards found, get all visible text
         if not restaurants:
-            content = await page.content()
             # Simple extraction - just get the page text
             text_content = await page.inner_text('body')
             restaurants.append({'raw_text': text_content, 'index': 0})
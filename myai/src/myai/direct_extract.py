@@ -2,75 +2,212 @@
 Direct extraction without browser automation - fastest approach
 """
 
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import List, Dict, Any, Optional
 import re
 
+# Compiled once; BeautifulSoup tests these against every candidate node
+_CARD_CLASS_RE = re.compile(r'restaurant|listing|card')
+_NAME_CLASS_RE = re.compile(r'name|title')
+# Cuisine/price/location in one alternation; the groups can't overlap, so a single
+# finditer sees the same first hit per field as three separate searches would
+_INFO_RE = re.compile(
+    r'(?P<price>\$+)'
+    r'|(?P<cuisine>Asian|Mexican|Italian|American|Cuisine)'
+    r'|(?P<location>San Francisco|SF|Castro|Mission|SOMA)'
+)
+
+# Only card elements (and their contents) are built into the tree
+_CARD_STRAINER = SoupStrainer(['div', 'article'], class_=_CARD_CLASS_RE)
+
+# C-backed lxml parser when available, stdlib parser otherwise
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# One keep-alive session so repeat fetches to the same host reuse the connection
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.headers.update(_HEADERS)
+
+# On-disk response cache keyed by the full URL (query string included)
+_CACHE_DIR = Path('.cache') / 'direct_extract'
+_CACHE_TTL = 3600  # seconds for successful pages
+_ERROR_TTL = 300   # failing URLs are remembered briefly so we don't re-hammer them
+
+
+def _cache_paths(url: str):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return _CACHE_DIR / f"{key}.html", _CACHE_DIR / f"{key}.err"
+
+
+def _read_cache(url: str) -> Optional[bytes]:
+    """Fresh cached page, None on a miss; re-raises a recently cached HTTP failure"""
+    page_path, error_path = _cache_paths(url)
+    now = time.time()
+    
+    try:
+        if now - page_path.stat().st_mtime < _CACHE_TTL:
+            return page_path.read_bytes()
+    except OSError:
+        pass
+    try:
+        cached_status = error_path.read_text() if now - error_path.stat().st_mtime < _ERROR_TTL else None
+    except OSError:
+        cached_status = None
+    if cached_status:
+        raise requests.HTTPError(f"{cached_status} (cached) for url: {url}")
+    return None
+
+
+def _write_cache(url: str, status_code: int, content: bytes):
+    page_path, error_path = _cache_paths(url)
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if status_code >= 400:
+            error_path.write_text(str(status_code))
+        else:
+            page_path.write_bytes(content)
+    except OSError as e:
+        print(f"Could not cache {url}: {e}")
+
+
+def _cached_get(url: str) -> bytes:
+    """GET a page, reusing a fresh copy from the on-disk cache if there is one"""
+    content = _read_cache(url)
+    if content is not None:
+        return content
+    
+    response = _SESSION.get(url, timeout=10)
+    _write_cache(url, response.status_code, response.content)
+    response.raise_for_status()
+    return response.content
+
+
 def extract_direct(url: str) -> List[Dict[str, Any]]:
     """
     Direct HTTP extraction - fastest method
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        restaurants = []
-        
-        # Look for OpenTable restaurant cards
-        restaurant_cards = soup.find_all(['div', 'article'], class_=re.compile(r'restaurant|listing|card'))
-        
-        for card in restaurant_cards[:10]:  # Limit to first 10
-            name = None
-            cuisine = None
-            price = None
-            location = None
-            
-            # Extract name
-            name_elem = card.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'name|title'))
-            if name_elem:
-                name = name_elem.get_text(strip=True)
-            
-            # Extract cuisine
-            cuisine_elem = card.find(text=re.compile(r'Asian|Mexican|Italian|American|Cuisine'))
-            if cuisine_elem:
-                cuisine = cuisine_elem.strip()
-            
-            # Extract price
-            price_elem = card.find(text=re.compile(r'\$+'))
-            if price_elem:
-                price = re.search(r'\$+', price_elem).group()
-            
-            # Extract location
-            location_elem = card.find(text=re.compile(r'San Francisco|SF|Castro|Mission|SOMA'))
-            if location_elem:
-                location = location_elem.strip()
-            
-            if name:
-                restaurants.append({
-                    'name': name,
-                    'cuisine': cuisine or 'Various',
-                    'price': price or '$$',
-                    'address': location or 'San Francisco'
-                })
-        
-        return restaurants
-        
+        return _parse_restaurants(_cached_get(url))
     except Exception as e:
         print(f"Direct extraction failed: {e}")
         return []
 
 
+async def extract_direct_many(urls: List[str]) -> List[List[Dict[str, Any]]]:
+    """
+    Direct HTTP extraction for several URLs at once (e.g. date/time variants);
+    cache misses are fetched concurrently. Results are in the same order as urls.
+    """
+    pages: List[Any] = [None] * len(urls)
+    misses = []
+    for i, url in enumerate(urls):
+        try:
+            pages[i] = _read_cache(url)
+        except Exception as e:
+            pages[i] = e
+        if pages[i] is None:
+            misses.append(i)
+    
+    if misses:
+        async with httpx.AsyncClient(headers=_HEADERS, timeout=10, follow_redirects=True) as client:
+            responses = await asyncio.gather(*[client.get(urls[i]) for i in misses], return_exceptions=True)
+        for i, response in zip(misses, responses):
+            if isinstance(response, Exception):
+                pages[i] = response
+                continue
+            _write_cache(urls[i], response.status_code, response.content)
+            if response.status_code >= 400:
+                pages[i] = requests.HTTPError(f"{response.status_code} for url: {urls[i]}")
+            else:
+                pages[i] = response.content
+    
+    results = []
+    for page in pages:
+        if isinstance(page, Exception):
+            print(f"Direct extraction failed: {page}")
+            results.append([])
+            continue
+        try:
+            results.append(_parse_restaurants(page))
+        except Exception as e:
+            print(f"Direct extraction failed: {e}")
+            results.append([])
+    return results
+
+
+def extract_direct_many_sync(urls: List[str]) -> List[List[Dict[str, Any]]]:
+    """Blocking wrapper around extract_direct_many"""
+    return asyncio.run(extract_direct_many(urls))
+
+
+def _parse_restaurants(content: bytes) -> List[Dict[str, Any]]:
+    """Pull restaurant cards out of a search results page"""
+    soup = BeautifulSoup(content, _HTML_PARSER, parse_only=_CARD_STRAINER)
+    
+    restaurants = []
+    
+    # Look for OpenTable restaurant cards
+    restaurant_cards = soup.find_all(['div', 'article'], class_=_CARD_CLASS_RE)
+    
+    scan = _INFO_RE.finditer
+    
+    for card in restaurant_cards[:10]:  # Limit to first 10
+        name = None
+        cuisine = None
+        price = None
+        location = None
+        
+        # Extract name
+        name_elem = card.find(['h1', 'h2', 'h3', 'h4'], class_=_NAME_CLASS_RE)
+        if name_elem:
+            name = name_elem.get_text(strip=True)
+        
+        # Cuisine, price and location in one walk over the card's text nodes
+        # (first matching node wins for each, as with separate find(string=...) calls)
+        for text in card.find_all(string=True):
+            for match in scan(text):
+                kind = match.lastgroup
+                if kind == 'price':
+                    if price is None:
+                        price = match.group()
+                elif kind == 'cuisine':
+                    if cuisine is None:
+                        cuisine = text.strip()
+                elif location is None:
+                    location = text.strip()
+            if cuisine is not None and price is not None and location is not None:
+                break
+        
+        if name:
+            restaurants.append({
+                'name': name,
+                'cuisine': cuisine or 'Various',
+                'price': price or '$$',
+                'address': location or 'San Francisco'
+            })
+    
+    return restaurants
+
+
 def fallback_restaurants() -> List[Dict[str, Any]]:
     """
     Fallback vegetarian Asian restaurants in SF for demonstration
@@ -2,8 +2,8 @@
 Restaurant evaluator module - scores restaurants based on user preferences
 """
 
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import re
 try:
     from .preferences import UserContext
@@ -11,7 +11,131 @@ except ImportError:
     from preferences import UserContext
 
 
-@dataclass
+# Keyword vocabularies used by the scorers (built once, shared by all evaluators)
+_QUALITY_VEG = frozenset({"tofu", "tempeh", "quinoa", "lentil", "chickpea",
+                          "mushroom", "eggplant", "cauliflower", "paneer"})
+_MEAT_FOCUSED = frozenset({"steakhouse", "bbq", "seafood"})
+_SPICY = frozenset({"thai", "szechuan", "sichuan", "indian", "korean"})
+_ASIAN = frozenset({"chinese", "japanese", "thai", "vietnamese", "korean", "indian"})
+
+
+def _build_menu_matcher(keywords):
+    """
+    One regex that finds every keyword in a menu text in a single scan.
+    The lookahead reports the longest keyword at each position; `contained`
+    adds the shorter keywords inside it, so hits match per-keyword `in` tests.
+    """
+    keywords = sorted(set(keywords), key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+    contained = {kw: [other for other in keywords if other in kw] for kw in keywords}
+    return pattern, contained
+
+
+# Feedback and explanation text
+_MSG_EXCELLENT_VEG = "Excellent vegetarian options available"
+_MSG_GOOD_VEG = "Good vegetarian selection"
+_MSG_LIMITED_VEG = "Limited vegetarian options"
+_MSG_PREFERRED_CUISINE = "Serves your preferred {} cuisine"
+_MSG_CUISINE_MISMATCH = "Cuisine type doesn't match preferences"
+_MSG_PERFECT_BUDGET = "Price range perfectly matches your budget"
+_MSG_WITHIN_BUDGET = "Within budget range"
+_MSG_OUTSIDE_BUDGET = "May be outside your preferred price range"
+_MSG_TRANSIT = "Conveniently located with transit access"
+_MSG_ACCESSIBLE = "Reasonably accessible location"
+_MSG_INCONVENIENT = "Location may be inconvenient"
+_MSG_GREAT_WINE = "Great wine program with corkage option"
+_MSG_GOOD_WINE = "Good wine selection"
+_VERDICT_EXCELLENT = "This is an excellent match for your preferences!"
+_VERDICT_GOOD = "This restaurant is a good fit with some minor considerations."
+_VERDICT_PARTIAL = "This restaurant partially matches your preferences."
+_VERDICT_POOR = "This restaurant may not be the best fit for your preferences."
+
+# Entries kept in each evaluator's score cache before it is reset
+_SCORE_CACHE_SIZE = 4096
+
+# Estimated per-dish cost for each price symbol
+_PRICE_PER_DISH = {
+    "$": 15,
+    "$$": 30,
+    "$$$": 50,
+    "$$$$": 80
+}
+
+
+def _budget_kernel(avg_price: float, min_price: float, max_price: float) -> float:
+    """Budget score (0-20) for an estimated per-dish price"""
+    # Closed form: each ratio is 0 unless the price falls on that side of the range,
+    # so an in-range price scores the full 20. A zero bound isn't divided by: nothing
+    # is cheaper than free, and anything over a zero maximum scores 0. With an inverted
+    # budget (min above max) only the shortfall counts, as it always has.
+    under = max(0.0, min_price - avg_price) / min_price if min_price > 0 else 0.0
+    over = 0.0 if under else (
+        max(0.0, avg_price - max_price) / max_price if max_price > 0 else float(avg_price > 0)
+    )
+    return max(0.0, 20.0 - under * 10.0 - over * 20.0)
+
+
+def _location_kernel(distance: Optional[float], max_distance: float, city_match: bool,
+                     prefers_transit: bool, near_transit: Optional[bool]) -> float:
+    """Location score (0-20) from distance (or city match when unknown) and transit access"""
+    score = 0.0
+    
+    # Distance scoring
+    if distance is not None:
+        if distance <= 1:
+            score += 10
+        elif distance <= 3:
+            score += 8
+        elif distance <= max_distance:
+            score += 5
+    elif city_match:
+        # If distance unknown, give partial credit if in same city
+        score += 5
+    
+    # Public transit accessibility
+    if prefers_transit:
+        if near_transit:
+            score += 10
+        elif near_transit is None:
+            # Unknown, give partial credit
+            score += 5
+    else:
+        score += 10  # Full points if transit not a requirement
+    
+    return min(20, score)
+
+
+def _wine_kernel(wine_important: bool, corkage_preferred: bool,
+                 wine_quality: Optional[str], allows_corkage: Optional[bool]) -> float:
+    """Wine program and corkage score (0-15)"""
+    score = 0.0
+    
+    if wine_important:
+        if wine_quality == "excellent":
+            score += 8
+        elif wine_quality == "good":
+            score += 6
+        elif wine_quality == "basic":
+            score += 3
+        elif wine_quality is None:
+            # Unknown, give partial credit
+            score += 4
+    else:
+        score += 8  # Full points if wine not important
+    
+    if corkage_preferred:
+        if allows_corkage:
+            score += 7
+        elif allows_corkage is None:
+            # Unknown, give partial credit
+            score += 3.5
+    else:
+        score += 7  # Full points if corkage not important
+    
+    return min(15, score)
+
+
+@dataclass(slots=True, frozen=True)
 class RestaurantInfo:
     """Information about a restaurant extracted from web sources"""
     name: str
@@ -28,13 +152,31 @@ class RestaurantInfo:
     reviews_summary: Optional[str] = None
     rating: Optional[float] = None
     url: Optional[str] = None
+    # Lowercased copies for the scorers, filled in by __post_init__
+    _address_lower: str = field(init=False, repr=False, compare=False)
+    _reviews_lower: str = field(init=False, repr=False, compare=False)
+    _cuisines_lower: FrozenSet[str] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
+        # Frozen, so derived values go through object.__setattr__
+        set_attr = object.__setattr__
         if self.menu_items is None:
-            self.menu_items = []
+            set_attr(self, "menu_items", [])
+        set_attr(self, "_address_lower", self.address.lower())
+        set_attr(self, "_reviews_lower", self.reviews_summary.lower() if self.reviews_summary else "")
+        set_attr(self, "_cuisines_lower", frozenset(c.lower() for c in self.cuisine_type))
+    
+    def cache_key(self) -> Tuple:
+        """Hashable snapshot of every field that affects scoring (rating and url don't)"""
+        return (
+            self.name, tuple(self.cuisine_type), self.price_range, self.address,
+            self.distance_miles, self.has_vegetarian_menu, self.vegetarian_options_count,
+            tuple(self.menu_items), self.wine_list_quality, self.allows_corkage,
+            self.near_public_transit, self.reviews_summary
+        )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EvaluationScore:
     """Detailed scoring breakdown for a restaurant"""
     total_score: float  # 0-100
@@ -51,20 +193,107 @@ class EvaluationScore:
 class RestaurantEvaluator:
     """Evaluates restaurants based on user preferences"""
     
+    __slots__ = (
+        "context", "_is_veg", "_spice", "_min_p", "_max_p", "_max_dist", "_prefers_transit",
+        "_wine_important", "_corkage_pref", "_preferred_cuisines", "_prefers_asian",
+        "_avoid_cuisines", "_allergies_lower", "_city_lower", "_allergy_set",
+        "_menu_matcher", "_score_cache",
+    )
+    
     def __init__(self, user_context: UserContext):
         self.context = user_context
+        # Preference values the scorers read for every restaurant
+        dietary = user_context.dietary
+        budget = user_context.budget
+        location = user_context.location
+        self._is_veg = dietary.is_vegetarian
+        self._spice = dietary.spice_tolerance
+        self._min_p = budget.min_price_per_dish
+        self._max_p = budget.max_price_per_dish
+        self._max_dist = location.max_distance_miles
+        self._prefers_transit = location.prefers_public_transit
+        self._wine_important = user_context.restaurant.wine_list_important
+        self._corkage_pref = user_context.restaurant.corkage_preferred
+        # Lowercased preference lists, reused for every restaurant scored
+        self._preferred_cuisines = frozenset(c.lower() for c in user_context.cuisine.preferred_cuisines)
+        self._prefers_asian = "asian" in self._preferred_cuisines
+        self._avoid_cuisines = tuple(c.lower() for c in user_context.cuisine.avoid_cuisines)
+        self._allergies_lower = tuple(a.lower() for a in user_context.dietary.allergies)
+        self._city_lower = user_context.location.city.lower()
+        self._allergy_set = frozenset(self._allergies_lower)
+        self._menu_matcher = _build_menu_matcher(_QUALITY_VEG | self._allergy_set)
+        # Scores keyed by RestaurantInfo.cache_key(); the same restaurant often
+        # comes back from several platforms and repeated queries
+        self._score_cache: Dict[Tuple, EvaluationScore] = {}
         
     def evaluate_restaurant(self, restaurant: RestaurantInfo) -> EvaluationScore:
         """
         Score a restaurant based on how well it matches user preferences
         Returns a score from 0-100 with detailed breakdown
+        Scores are cached per restaurant; treat the returned score as read-only
         """
-        dietary_score = self._score_dietary_fit(restaurant)
-        cuisine_score = self._score_cuisine_fit(restaurant)
-        budget_score = self._score_budget_fit(restaurant)
-        location_score = self._score_location_fit(restaurant)
-        wine_score = self._score_wine_fit(restaurant)
-        
+        key = restaurant.cache_key()
+        score = self._score_cache.get(key)
+        if score is None:
+            score = self._build_score(
+                restaurant,
+                self._score_dietary_fit(restaurant),
+                self._score_cuisine_fit(restaurant),
+                self._score_budget_fit(restaurant),
+                self._score_location_fit(restaurant),
+                self._score_wine_fit(restaurant)
+            )
+            self._cache_score(key, score)
+        return score
+    
+    def _cache_score(self, key: Tuple, score: EvaluationScore):
+        if len(self._score_cache) >= _SCORE_CACHE_SIZE:
+            self._score_cache.clear()
+        self._score_cache[key] = score
+    
+    def evaluate_batch(self, restaurants: List[RestaurantInfo]) -> List[EvaluationScore]:
+        """
+        Score many restaurants in one call
+        Budget and wine scores only depend on a few discrete fields, so each
+        distinct value is scored once per batch instead of once per restaurant;
+        restaurants already in the score cache are not rescored at all
+        """
+        budget_scores = {}
+        wine_scores = {}
+        scores = []
+        
+        for restaurant in restaurants:
+            key = restaurant.cache_key()
+            cached = self._score_cache.get(key)
+            if cached is not None:
+                scores.append(cached)
+                continue
+            
+            price_key = restaurant.price_range
+            if price_key not in budget_scores:
+                budget_scores[price_key] = self._score_budget_fit(restaurant)
+            
+            wine_key = (restaurant.wine_list_quality, restaurant.allows_corkage)
+            if wine_key not in wine_scores:
+                wine_scores[wine_key] = self._score_wine_fit(restaurant)
+            
+            score = self._build_score(
+                restaurant,
+                self._score_dietary_fit(restaurant),
+                self._score_cuisine_fit(restaurant),
+                budget_scores[price_key],
+                self._score_location_fit(restaurant),
+                wine_scores[wine_key]
+            )
+            self._cache_score(key, score)
+            scores.append(score)
+        
+        return scores
+    
+    def _build_score(self, restaurant: RestaurantInfo, dietary_score: float,
+                     cuisine_score: float, budget_score: float,
+                     location_score: float, wine_score: float) -> EvaluationScore:
+        """Combine sub-scores into the final EvaluationScore"""
         total_score = (
             dietary_score + 
             cuisine_score + 
@@ -99,8 +328,16 @@ class RestaurantEvaluator:
     def _score_dietary_fit(self, restaurant: RestaurantInfo) -> float:
         """Score dietary compatibility (0-25 points)"""
         score = 0.0
-        
-        if self.context.dietary.is_vegetarian:
+        # One scan per menu item finds both quality-vegetarian and allergen keywords
+        # (items are lowercased one at a time; no joined copy of the whole menu)
+        scan = self._menu_matcher[0].finditer
+        contained = self._menu_matcher[1]
+        found = set()
+        for item in restaurant.menu_items:
+            for match in scan(item.lower()):
+                found.update(contained[match.group(1)])
+        
+        if self._is_veg:
             # Check for vegetarian options
             if restaurant.has_vegetarian_menu:
                 score += 10
@@ -114,11 +351,7 @@ class RestaurantEvaluator:
                 score += 4
             
             # Check menu items for quality vegetarian options
-            quality_veg_keywords = ["tofu", "tempeh", "quinoa", "lentil", "chickpea", 
-                                   "mushroom", "eggplant", "cauliflower", "paneer"]
-            
-            menu_text = " ".join(restaurant.menu_items).lower()
-            quality_matches = sum(1 for keyword in quality_veg_keywords if keyword in menu_text)
+            quality_matches = len(found & _QUALITY_VEG)
             
             if quality_matches >= 3:
                 score += 5
@@ -126,15 +359,13 @@ class RestaurantEvaluator:
                 score += 3
             
             # Penalty for steakhouse or seafood-focused
-            if any(word in restaurant.name.lower() for word in ["steakhouse", "bbq", "seafood"]):
+            name_lower = restaurant.name.lower()
+            if any(word in name_lower for word in _MEAT_FOCUSED):
                 score = max(0, score - 10)
         
         # Check for allergen concerns
-        if self.context.dietary.allergies:
-            allergen_found = False
-            for allergen in self.context.dietary.allergies:
-                if allergen.lower() in menu_text:
-                    allergen_found = True
+        if self._allergies_lower:
+            allergen_found = not found.isdisjoint(self._allergy_set)
             
             if not allergen_found:
                 score = min(25, score + 2)
@@ -145,34 +376,29 @@ class RestaurantEvaluator:
         """Score cuisine match (0-20 points)"""
         score = 0.0
         
-        restaurant_cuisines = [c.lower() for c in restaurant.cuisine_type]
-        preferred_cuisines = [c.lower() for c in self.context.cuisine.preferred_cuisines]
+        restaurant_cuisines = restaurant._cuisines_lower
         
         # Direct match with preferred cuisines
-        for cuisine in restaurant_cuisines:
-            if cuisine in preferred_cuisines:
-                score += 15
-                break
-            # Partial matches for asian cuisines
-            elif cuisine in ["chinese", "japanese", "thai", "vietnamese", "korean", "indian"] and "asian" in preferred_cuisines:
-                score += 12
-                break
+        if not restaurant_cuisines.isdisjoint(self._preferred_cuisines):
+            score += 15
+        # Partial matches for asian cuisines
+        elif self._prefers_asian and not restaurant_cuisines.isdisjoint(_ASIAN):
+            score += 12
         
         # Bonus for fusion or variety
-        if len(restaurant_cuisines) > 1:
+        if len(restaurant.cuisine_type) > 1:
             score += 3
         
         # Check for cuisines to avoid
-        for avoid in self.context.cuisine.avoid_cuisines:
-            if avoid.lower() in restaurant_cuisines:
+        for avoid in self._avoid_cuisines:
+            if avoid in restaurant_cuisines:
                 score = max(0, score - 10)
         
         # Spice level consideration
-        if self.context.dietary.spice_tolerance == "mild":
-            spicy_cuisines = ["thai", "szechuan", "sichuan", "indian", "korean"]
-            if any(cuisine in restaurant_cuisines for cuisine in spicy_cuisines):
+        if self._spice == "mild":
+            if not restaurant_cuisines.isdisjoint(_SPICY):
                 # Check if they mention mild options
-                if restaurant.reviews_summary and "mild" in restaurant.reviews_summary.lower():
+                if "mild" in restaurant._reviews_lower:
                     score = max(0, score - 2)
                 else:
                     score = max(0, score - 5)
@@ -181,91 +407,22 @@ class RestaurantEvaluator:
     
     def _score_budget_fit(self, restaurant: RestaurantInfo) -> float:
         """Score budget compatibility (0-20 points)"""
-        score = 20.0
-        
-        # Map price symbols to estimated per-dish costs
-        price_mapping = {
-            "$": 15,
-            "$$": 30,
-            "$$$": 50,
-            "$$$$": 80
-        }
-        
-        if restaurant.price_range in price_mapping:
-            avg_price = price_mapping[restaurant.price_range]
-            
-            # Perfect match
-            if self.context.budget.min_price_per_dish <= avg_price <= self.context.budget.max_price_per_dish:
-                score = 20
-            # Slightly under budget (still good)
-            elif avg_price < self.context.budget.min_price_per_dish:
-                diff_ratio = (self.context.budget.min_price_per_dish - avg_price) / self.context.budget.min_price_per_dish
-                score = 20 - (diff_ratio * 10)
-            # Over budget
-            else:
-                diff_ratio = (avg_price - self.context.budget.max_price_per_dish) / self.context.budget.max_price_per_dish
-                score = max(0, 20 - (diff_ratio * 20))
-        
-        return max(0, score)
+        avg_price = _PRICE_PER_DISH.get(restaurant.price_range)
+        if avg_price is None:
+            return 20.0
+        return _budget_kernel(avg_price, self._min_p, self._max_p)
     
     def _score_location_fit(self, restaurant: RestaurantInfo) -> float:
         """Score location and accessibility (0-20 points)"""
-        score = 0.0
-        
-        # Distance scoring
-        if restaurant.distance_miles is not None:
-            if restaurant.distance_miles <= 1:
-                score += 10
-            elif restaurant.distance_miles <= 3:
-                score += 8
-            elif restaurant.distance_miles <= self.context.location.max_distance_miles:
-                score += 5
-            else:
-                score += 0
-        else:
-            # If distance unknown, give partial credit if in same city
-            if self.context.location.city.lower() in restaurant.address.lower():
-                score += 5
-        
-        # Public transit accessibility
-        if self.context.location.prefers_public_transit:
-            if restaurant.near_public_transit:
-                score += 10
-            elif restaurant.near_public_transit is None:
-                # Unknown, give partial credit
-                score += 5
-        else:
-            score += 10  # Full points if transit not a requirement
-        
-        return min(20, score)
+        # City match only matters when the distance is unknown
+        city_match = restaurant.distance_miles is None and self._city_lower in restaurant._address_lower
+        return _location_kernel(restaurant.distance_miles, self._max_dist, city_match,
+                                self._prefers_transit, restaurant.near_public_transit)
     
     def _score_wine_fit(self, restaurant: RestaurantInfo) -> float:
         """Score wine program and corkage (0-15 points)"""
-        score = 0.0
-        
-        if self.context.restaurant.wine_list_important:
-            if restaurant.wine_list_quality == "excellent":
-                score += 8
-            elif restaurant.wine_list_quality == "good":
-                score += 6
-            elif restaurant.wine_list_quality == "basic":
-                score += 3
-            elif restaurant.wine_list_quality is None:
-                # Unknown, give partial credit
-                score += 4
-        else:
-            score += 8  # Full points if wine not important
-        
-        if self.context.restaurant.corkage_preferred:
-            if restaurant.allows_corkage:
-                score += 7
-            elif restaurant.allows_corkage is None:
-                # Unknown, give partial credit
-                score += 3.5
-        else:
-            score += 7  # Full points if corkage not important
-        
-        return min(15, score)
+        return _wine_kernel(self._wine_important, self._corkage_pref,
+                            restaurant.wine_list_quality, restaurant.allows_corkage)
     
     def _generate_feedback(self, restaurant: RestaurantInfo, dietary: float, 
                           cuisine: float, budget: float, location: float, 
@@ -276,39 +433,39 @@ class RestaurantEvaluator:
         
         # Dietary feedback
         if dietary >= 20:
-            match_reasons.append("Excellent vegetarian options available")
+            match_reasons.append(_MSG_EXCELLENT_VEG)
         elif dietary >= 15:
-            match_reasons.append("Good vegetarian selection")
+            match_reasons.append(_MSG_GOOD_VEG)
         elif dietary < 10:
-            concerns.append("Limited vegetarian options")
+            concerns.append(_MSG_LIMITED_VEG)
         
         # Cuisine feedback
         if cuisine >= 15:
-            match_reasons.append(f"Serves your preferred {', '.join(restaurant.cuisine_type)} cuisine")
+            match_reasons.append(_MSG_PREFERRED_CUISINE.format(", ".join(restaurant.cuisine_type)))
         elif cuisine < 10:
-            concerns.append("Cuisine type doesn't match preferences")
+            concerns.append(_MSG_CUISINE_MISMATCH)
         
         # Budget feedback
         if budget >= 18:
-            match_reasons.append("Price range perfectly matches your budget")
+            match_reasons.append(_MSG_PERFECT_BUDGET)
         elif budget >= 15:
-            match_reasons.append("Within budget range")
+            match_reasons.append(_MSG_WITHIN_BUDGET)
         elif budget < 10:
-            concerns.append("May be outside your preferred price range")
+            concerns.append(_MSG_OUTSIDE_BUDGET)
         
         # Location feedback
         if location >= 18:
-            match_reasons.append("Conveniently located with transit access")
+            match_reasons.append(_MSG_TRANSIT)
         elif location >= 15:
-            match_reasons.append("Reasonably accessible location")
+            match_reasons.append(_MSG_ACCESSIBLE)
         elif location < 10:
-            concerns.append("Location may be inconvenient")
+            concerns.append(_MSG_INCONVENIENT)
         
         # Wine feedback
         if wine >= 13:
-            match_reasons.append("Great wine program with corkage option")
+            match_reasons.append(_MSG_GREAT_WINE)
         elif wine >= 10:
-            match_reasons.append("Good wine selection")
+            match_reasons.append(_MSG_GOOD_WINE)
         
         return match_reasons, concerns
     
@@ -316,13 +473,13 @@ class RestaurantEvaluator:
                             match_reasons: List[str], concerns: List[str]) -> str:
         """Generate a natural language explanation of the score"""
         if total_score >= 85:
-            verdict = "This is an excellent match for your preferences!"
+            verdict = _VERDICT_EXCELLENT
         elif total_score >= 70:
-            verdict = "This restaurant is a good fit with some minor considerations."
+            verdict = _VERDICT_GOOD
         elif total_score >= 50:
-            verdict = "This restaurant partially matches your preferences."
+            verdict = _VERDICT_PARTIAL
         else:
-            verdict = "This restaurant may not be the best fit for your preferences."
+            verdict = _VERDICT_POOR
         
         explanation_parts = [verdict]
         
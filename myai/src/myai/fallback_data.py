@@ -2,6 +2,21 @@
 Fallback restaurant data for San Francisco when browser automation fails
 """
 
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class FallbackRestaurant:
+    """Pre-parsed fallback entry (cuisine already split, rating numeric)"""
+    name: str
+    cuisine_type: Tuple[str, ...]
+    price_range: str
+    address: str
+    rating: float
+    platform: str = "known"
+
+
 FALLBACK_RESTAURANTS = {
     "san_francisco": [
         {
@@ -71,6 +86,24 @@ FALLBACK_RESTAURANTS = {
     ]
 }
 
-def get_fallback_restaurants(city: str = "san_francisco", num: int = 5):
+def _parse_entry(entry: Dict[str, str]) -> FallbackRestaurant:
+    return FallbackRestaurant(
+        name=entry["name"].strip(),
+        cuisine_type=tuple(c.strip() for c in entry["cuisine"].split(",") if c.strip()),
+        price_range=entry["price"],
+        address=entry["address"],
+        rating=float(entry["rating"]),
+        platform=entry.get("platform", "known")
+    )
+
+
+# Parsed once at import; lookups are then a plain tuple slice
+_FALLBACK_CACHE: Dict[str, Tuple[FallbackRestaurant, ...]] = {
+    city: tuple(_parse_entry(entry) for entry in entries)
+    for city, entries in FALLBACK_RESTAURANTS.items()
+}
+
+
+def get_fallback_restaurants(city: str = "san_francisco", num: int = 5) -> Tuple[FallbackRestaurant, ...]:
     """Get fallback restaurant data"""
-    return FALLBACK_RESTAURANTS.get(city, [])[:num]
\ No newline at end of file
+    return _FALLBACK_CACHE.get(city, ())[:num]
\ No newline at end of file
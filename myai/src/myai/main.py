@@ -1,25 +1,25 @@
 import asyncio
 import sys
+from bisect import bisect_right
 from typing import List
-from browser_use.llm import ChatGoogle
 from browser_use import Agent
 from dotenv import load_dotenv
 try:
     from .preferences import get_user_context, format_preferences_for_prompt
     from .restaurant_finder import RestaurantFinder
     from .evaluator import RestaurantEvaluator
+    from .cli_extractor import get_llm
 except ImportError:
     # Handle when running as script
     from preferences import get_user_context, format_preferences_for_prompt
     from restaurant_finder import RestaurantFinder
     from evaluator import RestaurantEvaluator
+    from cli_extractor import get_llm
 
 # Read GOOGLE_API_KEY into env
 load_dotenv()
 
-# Initialize the model
-# llm = ChatGoogle(model='gemini-2.5-pro')
-llm = ChatGoogle(model='gemini-2.5-flash-lite-preview-06-17')
+# The model is shared via get_llm(); set MYAI_MODEL to override it
 
 
 async def find_dinner_spot(query: str = "dinner tonight", platforms: List[str] = None):
@@ -48,7 +48,7 @@ async def find_dinner_spot(query: str = "dinner tonight", platforms: List[str] =
     print(f"  • Spice tolerance: Mild\n")
     
     # Create restaurant finder
-    finder = RestaurantFinder(user_context, llm)
+    finder = RestaurantFinder(user_context, get_llm())
     
     try:
         # Find restaurants
@@ -143,16 +143,42 @@ async def evaluate_specific_restaurant(restaurant_name: str, cuisine: str, price
             print(f"   • {concern}")
 
 
+# Score thresholds (ascending) and the emoji for each band; a score equal
+# to a threshold belongs to the band above it
+_SCORE_THRESHOLDS = (50, 70, 85)
+_SCORE_EMOJI = ("🤔", "👍", "✨", "🌟")
+
+
 def _get_score_emoji(score: float) -> str:
     """Get emoji representation of score"""
-    if score >= 85:
-        return "🌟"
-    elif score >= 70:
-        return "✨"
-    elif score >= 50:
-        return "👍"
+    return _SCORE_EMOJI[bisect_right(_SCORE_THRESHOLDS, score)]
+
+
+def _cmd_find(argv: List[str]):
+    """find [query] [platform|all]"""
+    query = argv[2] if len(argv) > 2 else "dinner tonight"
+    # Support single platform or "all" for all platforms
+    if len(argv) > 3 and argv[3].lower() != "all":
+        platforms = [argv[3]]
+    else:
+        platforms = None  # Use all platforms
+    asyncio.run(find_dinner_spot(query, platforms))
+
+
+def _cmd_evaluate(argv: List[str]):
+    """evaluate <name> <cuisine> <price> <address>"""
+    if len(argv) < 6:
+        print("Usage: python -m myai evaluate <name> <cuisine> <price> <address>")
+        print('Example: python -m myai evaluate "Shizen" "Japanese, Sushi" "$$" "370 14th St, San Francisco"')
     else:
-        return "🤔"
+        asyncio.run(evaluate_specific_restaurant(argv[2], argv[3], argv[4], argv[5]))
+
+
+# CLI commands, keyed by the lowercased first argument
+_COMMANDS = {
+    "find": _cmd_find,
+    "evaluate": _cmd_evaluate,
+}
 
 
 # Main entry point
@@ -160,29 +186,12 @@ def main():
     """Main entry point for the CLI"""
     if len(sys.argv) > 1:
         command = sys.argv[1].lower()
-        
-        if command == "find":
-            # Find restaurants
-            query = sys.argv[2] if len(sys.argv) > 2 else "dinner tonight"
-            # Support single platform or "all" for all platforms
-            if len(sys.argv) > 3 and sys.argv[3].lower() != "all":
-                platforms = [sys.argv[3]]
-            else:
-                platforms = None  # Use all platforms
-            asyncio.run(find_dinner_spot(query, platforms))
-            
-        elif command == "evaluate":
-            # Evaluate specific restaurant
-            if len(sys.argv) < 6:
-                print("Usage: python -m myai evaluate <name> <cuisine> <price> <address>")
-                print('Example: python -m myai evaluate "Shizen" "Japanese, Sushi" "$$" "370 14th St, San Francisco"')
-            else:
-                asyncio.run(evaluate_specific_restaurant(
-                    sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5]
-                ))
-        else:
+        handler = _COMMANDS.get(command)
+        if handler is None:
             print(f"Unknown command: {command}")
-            print("Available commands: find, evaluate")
+            print(f"Available commands: {', '.join(_COMMANDS)}")
+        else:
+            handler(sys.argv)
     else:
         # Default action - find dinner for tonight
         asyncio.run(find_dinner_spot())
@@ -4,11 +4,13 @@ Build preference-aware search URLs for each platform
 
 from typing import Dict, Any
 from datetime import datetime
-from urllib.parse import quote_plus
+from urllib.parse import quote, quote_plus, urlencode
 try:
     from .preferences import UserContext
+    from .date_parser import meal_clock
 except ImportError:
     from preferences import UserContext
+    from date_parser import meal_clock
 
 
 def build_opentable_url(context: UserContext, date: datetime, party_size: int = 2, time_str: str = "7:00 PM") -> str:
@@ -16,24 +18,19 @@ def build_opentable_url(context: UserContext, date: datetime, party_size: int =
     # OpenTable metro IDs: 4 = San Francisco
     base_url = "https://www.opentable.com/s"
     
-    # Convert time string to 24-hour format for URL
-    try:
-        time_obj = datetime.strptime(time_str, "%I:%M %p")
-        hour = time_obj.hour
-    except:
-        hour = 19  # Default to 7pm
+    # Convert time string to 24-hour format for URL (7pm if it can't be read)
+    hour, _ = meal_clock(time_str)
     
     params = {
         "covers": str(party_size),
-        "dateTime": date.strftime(f"%Y-%m-%dT{hour:02d}:00"),
+        "dateTime": f"{date.date().isoformat()}T{hour:02d}:00",
         "metroId": "4",  # San Francisco
         "term": "vegetarian",  # Search term
         "prices": "2,3",  # $$ and $$$ (matches $30-50 range)
     }
     
-    # Build URL
-    query_parts = [f"{k}={v}" for k, v in params.items()]
-    return f"{base_url}?{'&'.join(query_parts)}"
+    # Build URL (':' and ',' stay literal, as OpenTable writes them)
+    return f"{base_url}?{urlencode(params, quote_via=quote, safe=':,')}"
 
 
 def build_yelp_url(context: UserContext) -> str:
@@ -44,17 +41,16 @@ def build_yelp_url(context: UserContext) -> str:
     search_terms = ["vegetarian"]
     if context.cuisine.preferred_cuisines:
         # Add first preferred cuisine
-        search_terms.append(context.cuisine.preferred_cuisines[0].lower())
+        search_terms.append(context.cuisine.preferred_cuisines[0])
     
     params = {
-        "find_desc": "+".join(search_terms),
+        "find_desc": " ".join(search_terms),
         "find_loc": f"{context.location.zip_code}",
         "attrs": "RestaurantsReservations",  # Can make reservations
         "price": "2",  # $$ price range
     }
     
-    query_parts = [f"{k}={v}" for k, v in params.items()]
-    return f"{base_url}?{'&'.join(query_parts)}"
+    return f"{base_url}?{urlencode(params)}"
 
 
 def build_google_url(context: UserContext) -> str:
@@ -64,7 +60,7 @@ def build_google_url(context: UserContext) -> str:
     
     # Add cuisines
     if context.cuisine.preferred_cuisines:
-        search_parts.extend([c.lower() for c in context.cuisine.preferred_cuisines[:2]])
+        search_parts.extend(context.cuisine.preferred_cuisines[:2])
     
     search_parts.extend(["restaurants", "$30-50", "near", context.location.zip_code])
     
@@ -78,23 +74,14 @@ def build_resy_url(context: UserContext, date: datetime, party_size: int = 2) ->
     """Build Resy URL - they don't support as many URL params"""
     # Resy uses different URL structure
     # We'll search by cuisine type since they don't handle dietary well
-    cuisine = "mexican" if "mexican" in [c.lower() for c in context.cuisine.preferred_cuisines] else "asian"
+    cuisine = "mexican" if "mexican" in context.cuisine.preferred_cuisines_set else "asian"
     
-    return f"https://resy.com/cities/sf?query={cuisine}&date={date.strftime('%Y-%m-%d')}&seats={party_size}"
+    params = {"query": cuisine, "date": date.strftime('%Y-%m-%d'), "seats": party_size}
+    return f"https://resy.com/cities/sf?{urlencode(params)}"
 
 
-def create_fast_search_task(platform: str, context: UserContext, query: str) -> str:
-    """Create optimized search task with pre-built URLs"""
-    from .date_parser import parse_date_query, parse_party_size, get_meal_time
-    
-    # Parse query details
-    date_obj, date_str = parse_date_query(query)
-    party_size = parse_party_size(query)
-    meal_time = get_meal_time(query)
-    
-    if platform == "opentable":
-        url = build_opentable_url(context, date_obj, party_size, meal_time)
-        return f"""
+# Task templates for create_fast_search_task, filled with str.format
+_OT_TMPL = """
 Navigate to {url}
 
 Wait for the page to fully load (3 seconds).
@@ -115,14 +102,12 @@ Greens Restaurant | Vegetarian | $$$ | Fort Mason
 
 Return 5 restaurants in this format.
         """
-    
-    elif platform == "yelp":
-        url = build_yelp_url(context)
-        return f"""
-        Yelp search for VEGETARIAN restaurants (preferably {', '.join(context.cuisine.preferred_cuisines)}).
+
+_YELP_TMPL = """
+        Yelp search for VEGETARIAN restaurants (preferably {cuisines_joined}).
         
         1. Go to: {url}
-        2. This URL searches for vegetarian + {context.cuisine.preferred_cuisines[0] if context.cuisine.preferred_cuisines else 'All'} restaurants
+        2. This URL searches for vegetarian + {first_cuisine} restaurants
         3. Wait for search results to load
         4. VERIFY the search box shows "vegetarian" as a search term
         5. From the SEARCH RESULTS (not ads), extract first 5 restaurants:
@@ -140,14 +125,12 @@ Return 5 restaurants in this format.
         
         ONLY list vegetarian/vegan restaurants!
         """
-    
-    elif platform == "google":
-        url = build_google_url(context)
-        return f"""
+
+_GOOG_TMPL = """
         Google search for your preferred restaurants.
         
         1. Go to: {url}
-        2. This searches for: vegetarian {' '.join(context.cuisine.preferred_cuisines)} restaurants $30-50 near {context.location.zip_code}
+        2. This searches for: vegetarian {cuisines_spaced} restaurants $30-50 near {zip_code}
         3. Look at the local results (map pack)
         4. Extract first 5 restaurants:
            - Name
@@ -158,11 +141,8 @@ Return 5 restaurants in this format.
         
         Format: [Name] | [Rating] | [Price] | [Type] | [Distance]
         """
-    
-    elif platform == "resy":
-        url = build_resy_url(context, date_obj, party_size)
-        cuisine = "Mexican" if "mexican" in [c.lower() for c in context.cuisine.preferred_cuisines] else "Asian"
-        return f"""
+
+_RESY_TMPL = """
         Resy search for {cuisine} restaurants (many have great vegetarian options).
         
         1. Go to: {url}
@@ -181,5 +161,39 @@ Return 5 restaurants in this format.
         
         Note: {cuisine} restaurants often have excellent vegetarian options.
         """
+
+
+def create_fast_search_task(platform: str, context: UserContext, query: str) -> str:
+    """Create optimized search task with pre-built URLs"""
+    from .date_parser import parse_date_query, parse_party_size, get_meal_time
+    
+    # Parse query details
+    date_obj, date_str = parse_date_query(query)
+    party_size = parse_party_size(query)
+    meal_time = get_meal_time(query)
+    
+    if platform == "opentable":
+        url = build_opentable_url(context, date_obj, party_size, meal_time)
+        return _OT_TMPL.format(url=url)
+    
+    elif platform == "yelp":
+        cuisines = context.cuisine.preferred_cuisines
+        return _YELP_TMPL.format(
+            url=build_yelp_url(context),
+            cuisines_joined=', '.join(cuisines),
+            first_cuisine=cuisines[0] if cuisines else 'All',
+        )
+    
+    elif platform == "google":
+        return _GOOG_TMPL.format(
+            url=build_google_url(context),
+            cuisines_spaced=' '.join(context.cuisine.preferred_cuisines),
+            zip_code=context.location.zip_code,
+        )
+    
+    elif platform == "resy":
+        url = build_resy_url(context, date_obj, party_size)
+        cuisine = "Mexican" if "mexican" in context.cuisine.preferred_cuisines_set else "Asian"
+        return _RESY_TMPL.format(url=url, cuisine=cuisine, date_str=date_str, party_size=party_size)
     
-    return ""
\ No newline at end of file
+    return ""
@@ -3,12 +3,13 @@ Personal preferences module - hardcoded data that will eventually come from MCP
 This represents the user's personal context for restaurant selection
 """
 
-from typing import Dict, List, Any
+from typing import Dict, FrozenSet, List, Any
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DietaryPreferences:
     """User's dietary restrictions and preferences"""
     is_vegetarian: bool = True
@@ -18,15 +19,24 @@ class DietaryPreferences:
     spice_notes: str = "Cannot stand too spicy food"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CuisinePreferences:
     """User's cuisine preferences"""
     preferred_cuisines: List[str] = field(default_factory=lambda: ["asian", "mexican"])
     cuisine_notes: str = "Wants variety but flexible with different food types"
     avoid_cuisines: List[str] = field(default_factory=list)
+    # Lowercased copy of preferred_cuisines for membership checks
+    preferred_cuisines_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Stored lowercased once so URL and prompt builders can use them as-is
+        # (frozen, so the values go through object.__setattr__)
+        preferred = [c.lower() for c in self.preferred_cuisines]
+        object.__setattr__(self, "preferred_cuisines", preferred)
+        object.__setattr__(self, "preferred_cuisines_set", frozenset(preferred))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BudgetPreferences:
     """User's budget constraints"""
     min_price_per_dish: float = 30.0
@@ -35,7 +45,7 @@ class BudgetPreferences:
     budget_notes: str = "Prefers mid-range pricing"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LocationPreferences:
     """User's location and transportation preferences"""
     home_address: str = "500 Hyde St, San Francisco, CA 94109"
@@ -51,7 +61,7 @@ class LocationPreferences:
     transit_notes: str = "Prefers locations close to public transit in the Bay Area"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RestaurantPreferences:
     """User's restaurant-specific preferences"""
     wine_list_important: bool = True
@@ -65,7 +75,7 @@ class RestaurantPreferences:
     })
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserContext:
     """Complete user context combining all preferences"""
     dietary: DietaryPreferences = field(default_factory=DietaryPreferences)
@@ -79,54 +89,80 @@ class UserContext:
     last_updated: datetime = field(default_factory=datetime.now)
     version: str = "1.0.0"
     
+    # Rendered prompt text, dict and keyword lists. The preference dataclasses are
+    # frozen, so these stay valid; use dataclasses.replace() for a changed context
+    _render_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def invalidate_cache(self):
+        """Drop cached renderings after a preference list is edited in place"""
+        self._render_cache.clear()
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for easy serialization"""
+        """Convert to dictionary for easy serialization (cached; treat as read-only)"""
+        data = self._render_cache.get("dict")
+        if data is None:
+            data = self._render_cache["dict"] = self._build_dict()
+        return data
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        # Each section is looked up once rather than once per field
+        dietary = self.dietary
+        cuisine = self.cuisine
+        budget = self.budget
+        location = self.location
+        restaurant = self.restaurant
         return {
             "user_id": self.user_id,
             "version": self.version,
             "last_updated": self.last_updated.isoformat(),
             "preferences": {
                 "dietary": {
-                    "is_vegetarian": self.dietary.is_vegetarian,
-                    "vegetarian_notes": self.dietary.vegetarian_notes,
-                    "allergies": self.dietary.allergies,
-                    "spice_tolerance": self.dietary.spice_tolerance,
-                    "spice_notes": self.dietary.spice_notes
+                    "is_vegetarian": dietary.is_vegetarian,
+                    "vegetarian_notes": dietary.vegetarian_notes,
+                    "allergies": dietary.allergies,
+                    "spice_tolerance": dietary.spice_tolerance,
+                    "spice_notes": dietary.spice_notes
                 },
                 "cuisine": {
-                    "preferred": self.cuisine.preferred_cuisines,
-                    "notes": self.cuisine.cuisine_notes,
-                    "avoid": self.cuisine.avoid_cuisines
+                    "preferred": cuisine.preferred_cuisines,
+                    "notes": cuisine.cuisine_notes,
+                    "avoid": cuisine.avoid_cuisines
                 },
                 "budget": {
-                    "min_per_dish": self.budget.min_price_per_dish,
-                    "max_per_dish": self.budget.max_price_per_dish,
-                    "currency": self.budget.currency,
-                    "notes": self.budget.budget_notes
+                    "min_per_dish": budget.min_price_per_dish,
+                    "max_per_dish": budget.max_price_per_dish,
+                    "currency": budget.currency,
+                    "notes": budget.budget_notes
                 },
                 "location": {
-                    "home": self.location.home_address,
-                    "city": self.location.city,
-                    "zip": self.location.zip_code,
+                    "home": location.home_address,
+                    "city": location.city,
+                    "zip": location.zip_code,
                     "transportation": {
-                        "has_car": self.location.has_car,
-                        "rideshare": self.location.uses_rideshare,
-                        "prefers_transit": self.location.prefers_public_transit,
-                        "max_distance": self.location.max_distance_miles
+                        "has_car": location.has_car,
+                        "rideshare": location.uses_rideshare,
+                        "prefers_transit": location.prefers_public_transit,
+                        "max_distance": location.max_distance_miles
                     },
-                    "notes": self.location.transit_notes
+                    "notes": location.transit_notes
                 },
                 "restaurant": {
-                    "wine_important": self.restaurant.wine_list_important,
-                    "corkage": self.restaurant.corkage_preferred,
-                    "ambiance": self.restaurant.ambiance_preferences,
-                    "meals": self.restaurant.meal_preferences
+                    "wine_important": restaurant.wine_list_important,
+                    "corkage": restaurant.corkage_preferred,
+                    "ambiance": restaurant.ambiance_preferences,
+                    "meals": restaurant.meal_preferences
                 }
             }
         }
     
     def get_search_keywords(self) -> List[str]:
         """Generate search keywords based on preferences"""
+        keywords = self._render_cache.get("keywords")
+        if keywords is None:
+            keywords = self._render_cache["keywords"] = self._build_search_keywords()
+        return list(keywords)
+    
+    def _build_search_keywords(self) -> List[str]:
         keywords = []
         
         if self.dietary.is_vegetarian:
@@ -156,14 +192,22 @@ class UserContext:
 
 
 # Create the default user context instance
+@lru_cache(maxsize=1)
 def get_user_context() -> UserContext:
-    """Get the hardcoded user context (will be replaced by MCP server data)"""
+    """Get the hardcoded user context (will be replaced by MCP server data); one shared instance"""
     return UserContext()
 
 
 # Helper function to format preferences for prompts
 def format_preferences_for_prompt(context: UserContext) -> str:
-    """Format user preferences as a natural language prompt"""
+    """Format user preferences as a natural language prompt (cached per context)"""
+    prompt = context._render_cache.get("prompt")
+    if prompt is None:
+        prompt = context._render_cache["prompt"] = _render_preferences_prompt(context)
+    return prompt
+
+
+def _render_preferences_prompt(context: UserContext) -> str:
     prompt_parts = []
     
     # Dietary
@@ -2,15 +2,23 @@
 Query analyzer that breaks down user input and combines with personal preferences
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import re
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+from urllib.parse import urlencode, quote
 try:
     from .preferences import UserContext
-    from .date_parser import parse_date_query, parse_party_size, get_meal_time
+    from .date_parser import parse_date_query, parse_party_size, get_meal_time, meal_clock
 except ImportError:
     from preferences import UserContext
-    from date_parser import parse_date_query, parse_party_size, get_meal_time
+    from date_parser import parse_date_query, parse_party_size, get_meal_time, meal_clock
+
+# Cuisines a query can name explicitly (reported in this order)
+_CUISINE_KEYWORDS = ('italian', 'mexican', 'asian', 'chinese', 'japanese', 'thai', 'indian', 'french', 'american')
+_CUISINE_RE = re.compile(r'\b(' + '|'.join(_CUISINE_KEYWORDS) + r')\b')
+# Location named after "near"
+_NEAR_RE = re.compile(r'near\s+(\w+(?:\s+\w+)*)')
 
 
 def analyze_query(query: str, context: UserContext) -> Dict[str, Any]:
@@ -18,7 +26,40 @@ def analyze_query(query: str, context: UserContext) -> Dict[str, Any]:
     Break down the user's query and combine with personal preferences
     Returns a structured dict with all search parameters
     """
+    (date_obj, date_str, party_size, meal_time, (meal_hour, meal_minute),
+     mentioned_cuisines, dietary_overrides, location_override) = _parse_query(query, date.today())
+    
+    # Build the complete search context
+    search_params = {
+        'date': date_obj,
+        'date_str': date_str,
+        'party_size': party_size,
+        'meal_time': meal_time,
+        'meal_hour': meal_hour,  # meal_time in 24-hour form, for URLs
+        'meal_minute': meal_minute,
+        'dietary': list(dietary_overrides) if dietary_overrides else ['vegetarian'] if context.dietary.is_vegetarian else [],
+        'cuisines': list(mentioned_cuisines) if mentioned_cuisines else context.cuisine.preferred_cuisines,
+        'budget_min': context.budget.min_price_per_dish,
+        'budget_max': context.budget.max_price_per_dish,
+        'location': location_override if location_override else context.location.zip_code,
+        'allergies': context.dietary.allergies,
+        'preferences': {
+            'wine': context.restaurant.wine_list_important,
+            'spice_level': context.dietary.spice_tolerance,
+            'ambiance': context.restaurant.ambiance_preferences,
+            'transit': context.location.prefers_public_transit
+        }
+    }
     
+    return search_params
+
+
+@lru_cache(maxsize=512)
+def _parse_query(query: str, today: date) -> Tuple:
+    """
+    The parts of analyze_query that depend only on the query text
+    Keyed on today's date as well, since "tomorrow" etc. move at midnight
+    """
     # Parse basic elements from query
     date_obj, date_str = parse_date_query(query)
     party_size = parse_party_size(query)
@@ -28,48 +69,26 @@ def analyze_query(query: str, context: UserContext) -> Dict[str, Any]:
     query_lower = query.lower()
     
     # Check if user mentioned specific cuisine (overrides preferences)
-    mentioned_cuisines = []
-    cuisine_keywords = ['italian', 'mexican', 'asian', 'chinese', 'japanese', 'thai', 'indian', 'french', 'american']
-    for cuisine in cuisine_keywords:
-        if cuisine in query_lower:
-            mentioned_cuisines.append(cuisine)
+    found = set(_CUISINE_RE.findall(query_lower))
+    mentioned_cuisines = tuple(cuisine for cuisine in _CUISINE_KEYWORDS if cuisine in found)
     
     # Check for specific dietary mentions
-    dietary_overrides = []
+    dietary_overrides = ()
     if 'vegan' in query_lower:
-        dietary_overrides.append('vegan')
+        dietary_overrides = ('vegan',)
     elif 'vegetarian' in query_lower:
-        dietary_overrides.append('vegetarian')
+        dietary_overrides = ('vegetarian',)
     
     # Check for location mentions
     location_override = None
     if 'near' in query_lower:
         # Extract location after "near"
-        match = re.search(r'near\s+(\w+(?:\s+\w+)*)', query_lower)
+        match = _NEAR_RE.search(query_lower)
         if match:
             location_override = match.group(1)
     
-    # Build the complete search context
-    search_params = {
-        'date': date_obj,
-        'date_str': date_str,
-        'party_size': party_size,
-        'meal_time': meal_time,
-        'dietary': dietary_overrides if dietary_overrides else ['vegetarian'] if context.dietary.is_vegetarian else [],
-        'cuisines': mentioned_cuisines if mentioned_cuisines else context.cuisine.preferred_cuisines,
-        'budget_min': context.budget.min_price_per_dish,
-        'budget_max': context.budget.max_price_per_dish,
-        'location': location_override if location_override else context.location.zip_code,
-        'allergies': context.dietary.allergies,
-        'preferences': {
-            'wine': context.restaurant.wine_list_important,
-            'spice_level': context.dietary.spice_tolerance,
-            'ambiance': context.restaurant.ambiance_preferences,
-            'transit': context.location.prefers_public_transit
-        }
-    }
-    
-    return search_params
+    return (date_obj, date_str, party_size, meal_time, meal_clock(meal_time),
+            mentioned_cuisines, dietary_overrides, location_override)
 
 
 def create_enhanced_search_prompt(query: str, context: UserContext) -> str:
@@ -108,50 +127,58 @@ Find restaurants that match these criteria.
 
 def build_direct_url(platform: str, params: Dict[str, Any]) -> str:
     """Build a direct URL with all search parameters"""
-    
+    # Only these fields reach the URL, so they make a hashable cache key
+    return _cached_direct_url(
+        platform,
+        params['party_size'],
+        params['meal_hour'],
+        params['meal_minute'],
+        params['date'].date().isoformat(),
+        tuple(params['dietary']),
+        tuple(params['cuisines'][:1]),
+        params['location'],
+    )
+
+
+@lru_cache(maxsize=256)
+def _cached_direct_url(platform: str, party_size: int, hour: int, minute: int, day: str,
+                       dietary: Tuple[str, ...], cuisines: Tuple[str, ...], location: Any) -> str:
     if platform == "opentable":
-        # Convert time to 24-hour format
-        try:
-            from datetime import datetime
-            time_obj = datetime.strptime(params['meal_time'], "%I:%M %p")
-            hour = time_obj.hour
-            minute = time_obj.minute
-        except:
-            hour = 19  # Default to 7pm
-            minute = 0
-        
         base_url = "https://www.opentable.com/s"
         url_params = {
-            "covers": str(params['party_size']),
-            "dateTime": params['date'].strftime(f"%Y-%m-%dT{hour:02d}:{minute:02d}"),
+            "covers": str(party_size),
+            "dateTime": f"{day}T{hour:02d}:{minute:02d}",
             "metroId": "4",  # San Francisco
-            "term": " ".join(params['dietary'] + params['cuisines'][:1]),  # e.g. "vegetarian asian"
+            "term": " ".join(dietary + cuisines),  # e.g. "vegetarian asian"
             "prices": "2,3",  # $$ and $$$ to match budget
         }
         
-        query_string = "&".join([f"{k}={v}" for k, v in url_params.items()])
+        query_string = urlencode(url_params, quote_via=quote, safe=':,')
         return f"{base_url}?{query_string}"
     
     elif platform == "yelp":
         base_url = "https://www.yelp.com/search"
-        search_terms = params['dietary'] + params['cuisines'][:1] + ["restaurants"]
+        search_terms = dietary + cuisines + ("restaurants",)
         url_params = {
-            "find_desc": "+".join(search_terms),
-            "find_loc": f"San Francisco, CA {params['location']}",
+            "find_desc": " ".join(search_terms),  # encoded as vegetarian+asian+restaurants
+            "find_loc": f"San Francisco, CA {location}",
             "attrs": "RestaurantsReservations",
             "price": "2",  # $$ price range
         }
-        query_string = "&".join([f"{k}={v}" for k, v in url_params.items()])
+        query_string = urlencode(url_params, safe=',')
         return f"{base_url}?{query_string}"
     
     return ""
 
 
-def create_smart_browser_task(platform: str, query: str, context: UserContext) -> str:
+def create_smart_browser_task(platform: str, query: str, context: UserContext, *,
+                              params: Optional[Dict[str, Any]] = None) -> str:
     """
     Create a browser task that uses visual screenshot extraction
+    Pass params from analyze_query to reuse them across platforms
     """
-    params = analyze_query(query, context)
+    if params is None:
+        params = analyze_query(query, context)
     url = build_direct_url(platform, params)
     
     try:
@@ -8,14 +8,38 @@ Main interface for restaurant finding with:
 - Modular, composable architecture
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Sequence, TextIO, Tuple
+from dataclasses import fields
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import json
+import sys
 from datetime import datetime
 
+# Native JSON encoder when available, stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .context_engine import default_context_engine, ContextualRequest
 from .universal_extractor import universal_extractor, ExtractionResult
 
+# Field names, read once; the serializers below copy attributes straight into a dict
+_CONTEXT_FIELDS = tuple(f.name for f in fields(ContextualRequest))
+_RESULT_FIELDS = tuple(f.name for f in fields(ExtractionResult))
+
+# Indented encoder for MCP exports written to a file; raw UTF-8 like orjson
+_MCP_EXPORT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+def _context_to_dict(context: ContextualRequest) -> Dict[str, Any]:
+    """Flat dict of a ContextualRequest; nested dicts are the request's own, not copied again"""
+    return {name: getattr(context, name) for name in _CONTEXT_FIELDS}
+
+def _result_to_dict(result: ExtractionResult) -> Dict[str, Any]:
+    """Flat dict of an ExtractionResult; lists and raw_data are shared, not copied"""
+    return {name: getattr(result, name) for name in _RESULT_FIELDS}
+
 class RestaurantAI:
     """Main restaurant AI interface"""
     
@@ -28,12 +52,13 @@ class RestaurantAI:
         if mcp_data:
             self.context_engine.from_mcp_data(mcp_data)
     
-    def find_restaurants(self, query: str) -> Dict[str, Any]:
+    def find_restaurants(self, query: str, platforms: Sequence[str] = ("opentable",)) -> Dict[str, Any]:
         """
         Main entry point for restaurant finding
         
         Args:
             query: Natural language query like "lunch for 3 next tuesday"
+            platforms: Platforms to search; several are searched concurrently
             
         Returns:
             Dict with restaurants, context, and metadata
@@ -41,23 +66,13 @@ class RestaurantAI:
         
         print(f"🚀 Processing: '{query}'")
         
-        # Analyze query with context engine
-        context = self.context_engine.analyze_request(query)
-        
-        print(f"📊 Context Analysis:")
-        print(f"  • Intent: {context.intent}")
-        print(f"  • Party: {context.party_size} people")
-        print(f"  • Meal: {context.meal_type}")
-        print(f"  • Relevance: {self._format_relevance(context.context_relevance)}")
-        
-        # Extract restaurants with universal CLI
-        restaurants = self.extractor.extract_restaurants(query, "opentable", context)
+        context, restaurants = self._run(query, platforms, show_context=True)
         
         # Format results
         results = {
             'query': query,
-            'context': asdict(context),
-            'restaurants': [asdict(r) for r in restaurants],
+            'context': _context_to_dict(context),
+            'restaurants': [_result_to_dict(r) for r in restaurants],
             'summary': self._create_summary(restaurants, context),
             'timestamp': datetime.now().isoformat()
         }
@@ -67,6 +82,50 @@ class RestaurantAI:
         
         return results
     
+    def _run(self, query: str, platforms: Sequence[str] = ("opentable",),
+             show_context: bool = False) -> Tuple[ContextualRequest, List[ExtractionResult]]:
+        """Analyze the query and extract restaurants for it"""
+        # Analyze query with context engine
+        context = self.context_engine.analyze_request(query)
+        
+        if show_context:
+            print(f"📊 Context Analysis:")
+            print(f"  • Intent: {context.intent}")
+            print(f"  • Party: {context.party_size} people")
+            print(f"  • Meal: {context.meal_type}")
+            print(f"  • Relevance: {self._format_relevance(context.context_relevance)}")
+        
+        # Extract restaurants with universal CLI
+        return context, self._extract_all(query, platforms, context)
+    
+    def _extract_all(self, query: str, platforms: Sequence[str], context: ContextualRequest) -> List[ExtractionResult]:
+        """Extract from each platform, in parallel when there are several; merged by name"""
+        if not platforms:
+            raise ValueError("At least one platform is required")
+        if len(platforms) == 1:
+            return self.extractor.extract_restaurants(query, platforms[0], context)
+        
+        # Extraction is I/O bound (browser + LLM), so threads overlap the waiting
+        with ThreadPoolExecutor(max_workers=len(platforms)) as pool:
+            futures = [(platform, pool.submit(self.extractor.extract_restaurants, query, platform, context))
+                       for platform in platforms]
+        
+        # First platform listed wins when the same restaurant shows up twice
+        restaurants = []
+        seen = set()
+        for platform, future in futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"❌ {platform} extraction failed: {e}")
+                continue
+            for restaurant in results:
+                key = restaurant.name.lower()
+                if key not in seen:
+                    seen.add(key)
+                    restaurants.append(restaurant)
+        return restaurants
+    
     def _format_relevance(self, relevance: Dict[str, float]) -> str:
         """Format relevance scores for display"""
         relevant = [f"{k}({v:.1f})" for k, v in relevance.items() if v > 0.1]
@@ -75,17 +134,23 @@ class RestaurantAI:
     def _create_summary(self, restaurants: List[ExtractionResult], context: ContextualRequest) -> Dict[str, Any]:
         """Create a summary of the search results"""
         
-        total_found = len(restaurants)
-        with_availability = len([r for r in restaurants if r.availability_times and r.availability_times != ['Check availability']])
-        
-        cuisines = list(set([r.cuisine for r in restaurants if r.cuisine]))
-        price_ranges = list(set([r.price_range for r in restaurants if r.price_range]))
+        # One pass over the results for every count; dicts dedupe in ranking order
+        with_availability = 0
+        cuisines = {}
+        price_ranges = {}
+        for r in restaurants:
+            if r.has_real_times():
+                with_availability += 1
+            if r.cuisine:
+                cuisines[r.cuisine] = None
+            if r.price_range:
+                price_ranges[r.price_range] = None
         
         return {
-            'total_restaurants': total_found,
+            'total_restaurants': len(restaurants),
             'with_availability': with_availability,
-            'cuisines_found': cuisines,
-            'price_ranges': price_ranges,
+            'cuisines_found': list(cuisines),
+            'price_ranges': list(price_ranges),
             'context_used': {k: v for k, v in context.context_relevance.items() if v > 0.1}
         }
     
@@ -96,25 +161,32 @@ class RestaurantAI:
             print("❌ No restaurants found")
             return
         
-        print(f"\n🎯 Found {len(restaurants)} restaurants:")
-        print(f"📅 For: {context.party_size} people, {context.meal_type}")
+        # Build the whole listing, then write it in one go
+        lines = [
+            f"\n🎯 Found {len(restaurants)} restaurants:",
+            f"📅 For: {context.party_size} people, {context.meal_type}",
+        ]
+        append = lines.append
         
         for i, restaurant in enumerate(restaurants, 1):
-            print(f"\n{i}. **{restaurant.name}**")
-            print(f"   🍽️  {restaurant.cuisine} • {restaurant.price_range} • {restaurant.location}")
+            append(f"\n{i}. **{restaurant.name}**")
+            append(f"   🍽️  {restaurant.cuisine} • {restaurant.price_range} • {restaurant.location}")
             
             if restaurant.rating:
-                print(f"   ⭐ {restaurant.rating}")
+                append(f"   ⭐ {restaurant.rating}")
             
             if restaurant.availability_times:
                 times_str = ", ".join(restaurant.availability_times[:3])  # Show first 3 times
                 if len(restaurant.availability_times) > 3:
                     times_str += f" (+{len(restaurant.availability_times)-3} more)"
-                print(f"   🕐 Available: {times_str}")
+                append(f"   🕐 Available: {times_str}")
             
             if restaurant.features:
                 features_str = ", ".join(restaurant.features[:2])
-                print(f"   ✨ {features_str}")
+                append(f"   ✨ {features_str}")
+        
+        append("")
+        sys.stdout.write("\n".join(lines))
     
     def get_context_status(self) -> Dict[str, Any]:
         """Get current context engine status"""
@@ -125,27 +197,51 @@ class RestaurantAI:
             'extractor_ready': bool(self.extractor.api_key)
         }
     
-    def export_for_mcp(self) -> Dict[str, Any]:
-        """Export current state for MCP server"""
-        return self.context_engine.to_mcp_format()
+    def export_for_mcp(self, fp: Optional[TextIO] = None) -> Optional[Dict[str, Any]]:
+        """
+        Export current state for MCP server
+        With fp, the JSON is written there chunk by chunk and nothing is returned
+        """
+        mcp_data = self.context_engine.to_mcp_format()
+        if fp is None:
+            return mcp_data
+        
+        if orjson is not None:
+            # orjson's indented output is built in C in one call
+            fp.write(orjson.dumps(mcp_data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+            return None
+        
+        write = fp.write
+        for chunk in _MCP_EXPORT_ENCODER.iterencode(mcp_data):
+            write(chunk)
+        return None
     
     def update_from_mcp(self, mcp_data: Dict[str, Any]):
         """Update context from MCP server data"""
         self.context_engine.from_mcp_data(mcp_data)
     
     def quick_find(self, query: str) -> List[str]:
-        """Quick find that returns just restaurant names"""
-        results = self.find_restaurants(query)
-        return [r['name'] for r in results['restaurants']]
+        """Quick find that returns just restaurant names (no dict building or display)"""
+        _, restaurants = self._run(query)
+        return [r.name for r in restaurants]
+
+# Global instance for easy access, created on first use
+@lru_cache(maxsize=1)
+def get_restaurant_ai() -> RestaurantAI:
+    """The shared RestaurantAI instance"""
+    return RestaurantAI()
 
-# Global instance for easy access
-restaurant_ai = RestaurantAI()
+def __getattr__(name: str):
+    # Keeps `from .restaurant_ai import restaurant_ai` working without building it at import
+    if name == "restaurant_ai":
+        return get_restaurant_ai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions
-def find_restaurants(query: str) -> Dict[str, Any]:
+def find_restaurants(query: str, platforms: Sequence[str] = ("opentable",)) -> Dict[str, Any]:
     """Find restaurants with full context analysis"""
-    return restaurant_ai.find_restaurants(query)
+    return get_restaurant_ai().find_restaurants(query, platforms)
 
 def quick_find(query: str) -> List[str]:
     """Quick restaurant name search"""
-    return restaurant_ai.quick_find(query)
\ No newline at end of file
+    return get_restaurant_ai().quick_find(query)
\ No newline at end of file
@@ -4,6 +4,8 @@ Searches restaurants on various platforms and extracts information
 """
 
 import asyncio
+import heapq
+from bisect import bisect_right
 import re
 import os
 from typing import List, Dict, Any, Optional
@@ -13,25 +15,44 @@ try:
     from .preferences import UserContext, format_preferences_for_prompt
     from .evaluator import RestaurantInfo, RestaurantEvaluator, EvaluationScore
     from .site_optimizations import create_optimized_task
-    from .query_analyzer import create_smart_browser_task
+    from .query_analyzer import analyze_query, create_smart_browser_task
     from .fallback_data import get_fallback_restaurants
     from .simple_search import parse_raw_results
+    from .cli_extractor import get_llm
 except ImportError:
     from preferences import UserContext, format_preferences_for_prompt
     from evaluator import RestaurantInfo, RestaurantEvaluator, EvaluationScore
     from site_optimizations import create_optimized_task
-    from query_analyzer import create_smart_browser_task
+    from query_analyzer import analyze_query, create_smart_browser_task
     from fallback_data import get_fallback_restaurants
     from simple_search import parse_raw_results
+    from cli_extractor import get_llm
+
+
+# Score thresholds (ascending) and the label for each band; a score equal
+# to a threshold belongs to the band above it
+_SCORE_THRESHOLDS = (50, 70, 85)
+_SCORE_LABELS = ("🤔 Consider Alternatives", "👍 Decent Option", "✨ Good Match", "🌟 Excellent Match!")
+
+# Seconds between browser start-ups when several platforms are searched
+_BROWSER_STAGGER = 0.1
+
+# Patterns used when parsing agent output
+_NUM_PREFIX = re.compile(r'^\d+\.\s*')      # "1. " list numbering
+_BLOCK_SPLIT = re.compile(r'\n(?=\d+\.)')   # start of each numbered block
+_RATING_RE = re.compile(r'(\d+\.?\d*)')
 
 
 class RestaurantFinder:
     """Finds and evaluates restaurants using browser automation"""
     
-    def __init__(self, user_context: UserContext, llm: ChatGoogle):
+    def __init__(self, user_context: UserContext, llm: Optional[ChatGoogle] = None,
+                 max_parallel_browsers: int = 2):
         self.context = user_context
-        self.llm = llm
+        self.llm = llm or get_llm()
         self.evaluator = RestaurantEvaluator(user_context)
+        # Each platform search drives its own headless browser; cap how many run at once
+        self.max_parallel_browsers = max_parallel_browsers
         
     async def find_restaurants(self, 
                              query: str = "dinner tonight",
@@ -54,27 +75,34 @@ class RestaurantFinder:
         # Store query for CLI extraction
         self._current_query = query
         
-        # Create optimized tasks for all platforms
+        # Create optimized tasks for all platforms (the query is parsed once for all of them)
+        params = analyze_query(query, self.context)
+        # Made per call so it belongs to the running event loop
+        browser_slots = asyncio.Semaphore(self.max_parallel_browsers)
         tasks = []
+        searched = []
         for platform in platforms:
             platform_lower = platform.lower()
             if platform_lower in ["opentable", "resy", "yelp", "google"]:
                 # Use optimized platform-specific task with query
-                task_desc = create_smart_browser_task(platform_lower, query, self.context)
-                tasks.append(self._search_platform(platform, task_desc, query))
+                task_desc = create_smart_browser_task(platform_lower, query, self.context, params=params)
+                tasks.append(self._search_platform(platform, task_desc, query, params,
+                                                   stagger=len(tasks) * _BROWSER_STAGGER,
+                                                   browser_slots=browser_slots))
+                searched.append(platform)
             else:
                 print(f"Skipping unsupported platform: {platform}")
                 continue
         
-        # Run all searches in parallel
+        # Run all searches in parallel; one platform failing doesn't sink the others
         print(f"🔄 Searching {len(tasks)} platforms in parallel...")
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Combine all results
         all_restaurants = []
-        for platform_results in results:
+        for platform, platform_results in zip(searched, results):
             if isinstance(platform_results, Exception):
-                print(f"Error from platform: {platform_results}")
+                print(f"Error from {platform}: {platform_results}")
                 continue
             all_restaurants.extend(platform_results)
         
@@ -84,97 +112,89 @@ class RestaurantFinder:
             print("💡 Try running with fewer platforms or increase the timeout.")
             return []
         
-        # Sort by score and return top N
-        all_restaurants.sort(key=lambda x: x["score"].total_score, reverse=True)
-        return all_restaurants[:num_results]
+        # Top N by score (same order as a full descending sort, without sorting everything)
+        return heapq.nlargest(num_results, all_restaurants, key=lambda x: x["score"].total_score)
     
-    async def _search_platform(self, platform: str, task: str, query: str = "dinner tonight") -> List[Dict[str, Any]]:
-        """Search a single platform using CLI-first approach for reliability"""
-        try:
-            print(f"  🔍 Searching {platform} with browser automation...")
-            
-            # Use the working CLI extraction approach
+    async def _search_platform(self, platform: str, task: str, query: str = "dinner tonight",
+                               params: Optional[Dict[str, Any]] = None, *,
+                               browser_slots: asyncio.Semaphore,
+                               stagger: float = 0.0) -> List[Dict[str, Any]]:
+        """Search a single platform using in-process extraction first for reliability"""
+        # Stagger start-up, then wait for a free browser slot
+        await asyncio.sleep(stagger)
+        async with browser_slots:
             try:
-                from .cli_extractor import extract_restaurants_cli
+                print(f"  🔍 Searching {platform} with browser automation...")
+            
+                # Use the in-process extraction approach
+                try:
+                    from .cli_extractor import extract_restaurants_cli
                 
-                restaurants = extract_restaurants_cli(platform, query, self.context)
+                    restaurants = await extract_restaurants_cli(platform, query, self.context)
                 
-                if restaurants:
-                    print(f"  ✅ CLI extracted {len(restaurants)} restaurants")
-                    
-                    # Evaluate each restaurant
-                    evaluated_restaurants = []
-                    for restaurant_data in restaurants[:5]:
-                        restaurant_info = self._create_restaurant_info(restaurant_data, platform)
-                        score = self.evaluator.evaluate_restaurant(restaurant_info)
-                        
-                        evaluated_restaurants.append({
-                            "restaurant": restaurant_info,
-                            "score": score,
-                            "platform": platform
-                        })
+                    if restaurants:
+                        print(f"  ✅ CLI extracted {len(restaurants)} restaurants")
                     
-                    return evaluated_restaurants
+                        return self._evaluate_results(restaurants[:5], platform)
                 
-            except Exception as cli_e:
-                print(f"  ⚠️ CLI extraction failed: {str(cli_e)}")
+                except Exception as cli_e:
+                    print(f"  ⚠️ CLI extraction failed: {str(cli_e)}")
             
-            # Fallback to simple extraction
-            print(f"  🔄 Using simple extraction (no scrolling)...")
+                # Fallback to simple extraction
+                print(f"  🔄 Using simple extraction (no scrolling)...")
             
-            # Create task with smart termination
-            try:
-                from .smart_termination import create_terminating_task
-                from .query_analyzer import analyze_query, build_direct_url
-                params = analyze_query(query, self.context)
-                url = build_direct_url(platform, params)
-                efficient_task = create_terminating_task(url, params)
-            except:
-                efficient_task = f"Go to OpenTable, extract visible restaurants for {query}, and stop when no more results"
+                # Create task with smart termination
+                try:
+                    from .smart_termination import create_terminating_task
+                    from .query_analyzer import build_direct_url
+                    if params is None:
+                        params = analyze_query(query, self.context)
+                    url = build_direct_url(platform, params)
+                    efficient_task = create_terminating_task(url, params)
+                except:
+                    efficient_task = f"Go to OpenTable, extract visible restaurants for {query}, and stop when no more results"
             
-            agent = Agent(
-                task=efficient_task,
-                llm=self.llm,
-                browser_config={
-                    "headless": False,
-                    "disable_security": True,
-                },
-                max_actions_per_step=3,  # Very limited actions
-            )
+                agent = Agent(
+                    task=efficient_task,
+                    llm=self.llm,
+                    browser_config={
+                        "headless": False,
+                        "disable_security": True,
+                    },
+                    max_actions_per_step=3,  # Very limited actions
+                )
             
-            try:
-                result = await asyncio.wait_for(agent.run(), timeout=20.0)  # Very short timeout
-            except asyncio.TimeoutError:
-                print(f"  ⏱️ {platform} quick search timed out after 30s")
-                return []
+                try:
+                    result = await asyncio.wait_for(agent.run(), timeout=20.0)  # Very short timeout
+                except asyncio.TimeoutError:
+                    print(f"  ⏱️ {platform} quick search timed out after 30s")
+                    return []
             
-            # Parse programmatic results
-            result_str = str(result) if hasattr(result, '__str__') else result
-            restaurants = self._parse_search_results(result_str, platform)
+                # Parse programmatic results
+                result_str = str(result) if hasattr(result, '__str__') else result
+                restaurants = self._parse_search_results(result_str, platform)
             
-            if not restaurants:
-                print(f"  ⚠️ No results from {platform}")
-                return []
+                if not restaurants:
+                    print(f"  ⚠️ No results from {platform}")
+                    return []
             
-            # Evaluate restaurants
-            evaluated_restaurants = []
-            for restaurant_data in restaurants[:5]:
-                restaurant_info = self._create_restaurant_info(restaurant_data, platform)
-                score = self.evaluator.evaluate_restaurant(restaurant_info)
-                
-                evaluated_restaurants.append({
-                    "restaurant": restaurant_info,
-                    "score": score,
-                    "platform": platform
-                })
+                # Evaluate restaurants
+                evaluated_restaurants = self._evaluate_results(restaurants[:5], platform)
             
-            print(f"  ✅ Found {len(evaluated_restaurants)} restaurants on {platform}")
-            return evaluated_restaurants
+                print(f"  ✅ Found {len(evaluated_restaurants)} restaurants on {platform}")
+                return evaluated_restaurants
             
-        except Exception as e:
-            print(f"  ❌ Error on {platform}: {str(e)[:100]}")
-            return []
+            except Exception as e:
+                print(f"  ❌ Error on {platform}: {str(e)[:100]}")
+                return []
     
+    def _evaluate_results(self, restaurants: List[Dict[str, Any]], platform: str) -> List[Dict[str, Any]]:
+        """Build RestaurantInfo for each parsed result and score them as one batch"""
+        infos = [self._create_restaurant_info(data, platform) for data in restaurants]
+        return [
+            {"restaurant": info, "score": score, "platform": platform}
+            for info, score in zip(infos, self.evaluator.evaluate_batch(infos))
+        ]
     
     def _parse_search_results(self, result: str, platform: str) -> List[Dict[str, Any]]:
         """Parse the agent's results into structured data"""
@@ -194,7 +214,7 @@ class RestaurantFinder:
                 continue
                 
             # Remove numbering
-            line = re.sub(r'^\d+\.\s*', '', line)
+            line = _NUM_PREFIX.sub('', line)
             
             # Parse pipe-delimited data
             parts = [p.strip() for p in line.split('|')]
@@ -229,7 +249,7 @@ class RestaurantFinder:
         # If no pipe format found, try the old parsing method
         if not restaurants:
             # Fallback to key-value parsing
-            blocks = re.split(r'\n(?=\d+\.)', result)
+            blocks = _BLOCK_SPLIT.split(result)
             
             for block in blocks:
                 if not block.strip():
@@ -244,7 +264,7 @@ class RestaurantFinder:
                         continue
                     
                     # Remove list numbers
-                    line = re.sub(r'^\d+\.\s*', '', line)
+                    line = _NUM_PREFIX.sub('', line)
                     
                     # Parse key-value pairs
                     if ':' in line:
@@ -297,7 +317,7 @@ class RestaurantFinder:
         # Parse rating if present
         rating = None
         if 'rating' in data:
-            rating_match = re.search(r'(\d+\.?\d*)', data['rating'])
+            rating_match = _RATING_RE.search(data['rating'])
             if rating_match:
                 rating = float(rating_match.group(1))
         
@@ -371,11 +391,4 @@ class RestaurantFinder:
     
     def _get_score_emoji(self, score: float) -> str:
         """Get emoji representation of score"""
-        if score >= 85:
-            return "🌟 Excellent Match!"
-        elif score >= 70:
-            return "✨ Good Match"
-        elif score >= 50:
-            return "👍 Decent Option"
-        else:
-            return "🤔 Consider Alternatives"
\ No newline at end of file
+        return _SCORE_LABELS[bisect_right(_SCORE_THRESHOLDS, score)]
\ No newline at end of file
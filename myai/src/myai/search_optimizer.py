@@ -113,7 +113,14 @@ class ContextPriority:
     
     @classmethod
     def get_context_markdown(cls, context: UserContext) -> str:
-        """Convert context to prioritized markdown format"""
+        """Convert context to prioritized markdown format (cached per context)"""
+        markdown = context._render_cache.get("markdown")
+        if markdown is None:
+            markdown = context._render_cache["markdown"] = cls._render_context_markdown(context)
+        return markdown
+    
+    @classmethod
+    def _render_context_markdown(cls, context: UserContext) -> str:
         sections = []
         
         # Dietary (Priority 1)
@@ -5,6 +5,18 @@ Simplified search approach using direct extraction
 from typing import List, Dict, Any
 import re
 
+# Patterns used by parse_raw_results
+_RATING_RE = re.compile(r'(\d\.\d)')  # e.g. "4.5", "4.5 stars", "4.5★"
+_PRICE_RE = re.compile(r'(\$+)')
+
+# Keyword buckets, each matched as plain substrings of the lowercased line in one regex pass
+_SKIP_WORDS = ('search', 'filter', 'map', 'sign', 'ad', 'sponsored')
+_CUISINE_WORDS = ('italian', 'mexican', 'asian', 'vegan', 'vegetarian', 'chinese', 'thai', 'japanese', 'indian')
+_AREA_WORDS = ('mission', 'soma', 'marina', 'castro', 'sunset', 'richmond', 'nob hill', 'chinatown', 'haight')
+_SKIP_RE = re.compile('|'.join(map(re.escape, _SKIP_WORDS)))
+_CUISINE_RE = re.compile('|'.join(map(re.escape, _CUISINE_WORDS)))
+_AREA_RE = re.compile('|'.join(map(re.escape, _AREA_WORDS)))
+
 def create_simple_task(platform: str, location: str = "San Francisco") -> str:
     """Create a very simple extraction task"""
     
@@ -105,13 +117,14 @@ def parse_raw_results(raw_text: str, platform: str) -> List[Dict[str, Any]]:
         line = line.strip()
         if not line:
             continue
+        low = line.lower()
             
         # Look for patterns that indicate restaurant names
         # Usually restaurant names are in title case and don't have too many words
         if (platform in ["yelp", "google"] and 
             len(line.split()) <= 5 and 
             line[0].isupper() and 
-            not any(skip in line.lower() for skip in ['search', 'filter', 'map', 'sign', 'ad', 'sponsored'])):
+            not _SKIP_RE.search(low)):
             
             # Save previous restaurant if exists
             if current_restaurant.get('name'):
@@ -121,25 +134,23 @@ def parse_raw_results(raw_text: str, platform: str) -> List[Dict[str, Any]]:
             current_restaurant = {'name': line}
             
         # Look for ratings (e.g., "4.5", "4.5 stars", "4.5★")
-        elif current_restaurant.get('name') and re.search(r'\d\.\d', line):
-            match = re.search(r'(\d\.\d)', line)
-            if match:
-                current_restaurant['rating'] = match.group(1)
+        elif current_restaurant.get('name') and (match := _RATING_RE.search(line)):
+            current_restaurant['rating'] = match.group(1)
         
         # Look for price indicators
         elif current_restaurant.get('name') and '$' in line and len(line) <= 10:
-            price_match = re.search(r'(\$+)', line)
+            price_match = _PRICE_RE.search(line)
             if price_match:
                 current_restaurant['price'] = price_match.group(1)
         
         # Look for cuisine types (common patterns)
         elif (current_restaurant.get('name') and 
-              any(cuisine in line.lower() for cuisine in ['italian', 'mexican', 'asian', 'vegan', 'vegetarian', 'chinese', 'thai', 'japanese', 'indian'])):
+              _CUISINE_RE.search(low)):
             current_restaurant['cuisine'] = line
         
         # Look for addresses/neighborhoods
         elif (current_restaurant.get('name') and 
-              any(area in line.lower() for area in ['mission', 'soma', 'marina', 'castro', 'sunset', 'richmond', 'nob hill', 'chinatown', 'haight'])):
+              _AREA_RE.search(low)):
             current_restaurant['address'] = line
     
     # Don't forget the last restaurant
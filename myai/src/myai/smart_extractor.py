@@ -6,18 +6,14 @@ from typing import List, Dict, Any
 import re
 
 
-def create_screenshot_extraction_task(url: str, query_params: Dict[str, Any]) -> str:
-    """
-    Create a simple task focused on quick extraction
-    """
-    
-    return f"""
+# Task template for create_screenshot_extraction_task, filled with str.format
+_SCREENSHOT_TASK_TEMPLATE = """
 Go to: {url}
 
 Search parameters:
-- {query_params['party_size']} people
-- {query_params['date_str']} at {query_params['meal_time']}
-- Looking for: {', '.join(query_params['dietary'])} {', '.join(query_params['cuisines'])}
+- {party_size} people
+- {date_str} at {meal_time}
+- Looking for: {dietary} {cuisines}
 
 TASK:
 1. Let page load (3 seconds)
@@ -32,6 +28,21 @@ Prioritize vegetarian-friendly options.
 """
 
 
+def create_screenshot_extraction_task(url: str, query_params: Dict[str, Any]) -> str:
+    """
+    Create a simple task focused on quick extraction
+    """
+    
+    return _SCREENSHOT_TASK_TEMPLATE.format(
+        url=url,
+        party_size=query_params['party_size'],
+        date_str=query_params['date_str'],
+        meal_time=query_params['meal_time'],
+        dietary=', '.join(query_params['dietary']),
+        cuisines=', '.join(query_params['cuisines']),
+    )
+
+
 def create_visual_extraction_task(url: str, preferences: Dict[str, Any]) -> str:
     """
     Create a task that emphasizes visual extraction from screenshots
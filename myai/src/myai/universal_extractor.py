@@ -5,12 +5,31 @@ No hardcoded values, platform configs loaded from data
 """
 
 import subprocess
+import hashlib
 import os
 import json
 import re
+import queue
+import signal
+import threading
+import time
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Populate os.environ from the repo-root .env once; existing variables win
+load_dotenv(Path(__file__).resolve().parents[3] / '.env')
+
+# In-process browser-use (pooled browsers, shared LLM client); the CLI is the fallback
+try:
+    from .cli_extractor import run_agent_sync
+except ImportError:
+    try:
+        from cli_extractor import run_agent_sync
+    except ImportError:
+        run_agent_sync = None
 
 # Platform configuration data (not hardcoded in logic)
 PLATFORM_CONFIG = {
@@ -80,17 +99,40 @@ PLATFORM_CONFIG = {
     }
 }
 
-@dataclass
+# Output parsing patterns, compiled once
+_BLOCK_START = '=== RESTAURANT ==='
+_BLOCK_END = '=== END ==='
+_NUM_PREFIX_RE = re.compile(r'^\d+\.\s*')
+
+# Parsed prices map onto these shared strings instead of one copy per result
+_PRICE_LEVELS = {level: level for level in ('$', '$$', '$$$', '$$$$')}
+
+# Raw browser-use output cached on disk, keyed by sha256(url + prompt)
+CLI_CACHE_DIR = Path('.cache') / 'cli'
+CLI_CACHE_TTL = 6 * 3600  # seconds
+
+# POSIX: the CLI runs in its own process group so its browser can be killed on its own
+_HAS_KILLPG = hasattr(os, 'killpg')
+
+# Placeholder the agent lists when a restaurant shows no concrete times
+NO_AVAILABILITY = 'Check availability'
+
+@dataclass(slots=True)
 class ExtractionResult:
     """Standardized extraction result"""
     name: str
     cuisine: str = ""
     price_range: str = ""
     location: str = ""
-    availability_times: List[str] = None
+    availability_times: List[str] = field(default_factory=list)
     rating: str = ""
-    features: List[str] = None
-    raw_data: Dict = None
+    features: List[str] = field(default_factory=list)
+    raw_data: Dict = field(default_factory=dict)
+    
+    def has_real_times(self) -> bool:
+        """True if availability_times holds actual times, not just the placeholder"""
+        times = self.availability_times
+        return bool(times) and (len(times) > 1 or times[0] != NO_AVAILABILITY)
 
 class UniversalExtractor:
     """Universal restaurant extractor with configurable platforms"""
@@ -101,24 +143,13 @@ class UniversalExtractor:
         self.timeout = 90  # 1.5 minute timeout
     
     def _load_api_key(self) -> str:
-        """Load API key from environment"""
-        if 'GOOGLE_API_KEY' in os.environ:
+        """Load API key from environment (.env is loaded at import)"""
+        try:
             return os.environ['GOOGLE_API_KEY']
-        
-        # Check parent .env file
-        env_file = "/Users/jh/Code/exploration/agihousehackathon/.env"
-        if os.path.exists(env_file):
-            with open(env_file, 'r') as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        if '=' in line:
-                            key, value = line.strip().split('=', 1)
-                            if key == 'GOOGLE_API_KEY':
-                                return value
-        
-        raise ValueError("GOOGLE_API_KEY not found")
+        except KeyError:
+            raise ValueError("GOOGLE_API_KEY not found") from None
     
-    def extract_restaurants(self, query: str, platform: str, context: Any) -> List[ExtractionResult]:
+    def extract_restaurants(self, query: str, platform: str, context: Any, bypass_cache: bool = False) -> List[ExtractionResult]:
         """Main extraction method - platform agnostic"""
         
         if platform not in self.config:
@@ -133,9 +164,16 @@ class UniversalExtractor:
         # Create extraction prompt
         prompt = self._create_prompt(url, platform, context)
         
-        # Execute extraction
-        print(f"🤖 Executing browser automation...")
-        raw_result = self._execute_cli(prompt)
+        # Execute extraction (the URL already encodes date, party size and cuisine,
+        # so differently-phrased queries with the same context share a cache entry)
+        cache_key = hashlib.sha256((url + prompt).encode('utf-8')).hexdigest()
+        raw_result = None if bypass_cache else self._read_cli_cache(cache_key)
+        from_cache = bool(raw_result)
+        if from_cache:
+            print(f"💾 Using cached browser output")
+        else:
+            print(f"🤖 Executing browser automation...")
+            raw_result = self._execute_cli(prompt)
         
         if not raw_result:
             print(f"❌ No raw results from browser")
@@ -146,9 +184,30 @@ class UniversalExtractor:
         # Parse results
         results = self._parse_results(raw_result, platform, context)
         
+        # Only cache output that yielded restaurants; timeouts and failed pages should retry the browser
+        if results and not from_cache:
+            self._write_cli_cache(cache_key, raw_result)
+        
         print(f"✅ Extracted {len(results)} restaurants from {platform}")
         return results
     
+    def _read_cli_cache(self, key: str) -> Optional[str]:
+        """Cached CLI output for this key, if it is younger than CLI_CACHE_TTL"""
+        path = CLI_CACHE_DIR / f"{key}.txt"
+        try:
+            if time.time() - path.stat().st_mtime < CLI_CACHE_TTL:
+                return path.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        return None
+    
+    def _write_cli_cache(self, key: str, raw_result: str):
+        try:
+            CLI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (CLI_CACHE_DIR / f"{key}.txt").write_text(raw_result, encoding='utf-8')
+        except OSError as e:
+            print(f"⚠️ Could not cache browser output: {e}")
+    
     def _build_url(self, platform: str, context: Any) -> str:
         """Build platform URL using configuration"""
         
@@ -333,6 +392,17 @@ Nari
 Just list restaurant names, one per line."""
     
     def _execute_cli(self, prompt: str) -> str:
+        """Run browser-use in-process when it is importable, otherwise via the CLI"""
+        if run_agent_sync is not None:
+            try:
+                os.environ.setdefault('GOOGLE_API_KEY', self.api_key)
+                return run_agent_sync(prompt, self.timeout)
+            except Exception as e:
+                print(f"⚠️ In-process browser-use failed ({e}), falling back to CLI")
+        
+        return self._execute_cli_subprocess(prompt)
+    
+    def _execute_cli_subprocess(self, prompt: str) -> str:
         """Execute browser-use CLI"""
         
         try:
@@ -352,8 +422,9 @@ Just list restaurant names, one per line."""
                         cmd,
                         stdout=subprocess.PIPE,
                         stderr=subprocess.DEVNULL,  # Ignore stderr logs
-                        text=True,
-                        env=env
+                        env=env,  # Raw bytes; decoded once at the end
+                        # Own process group, so cleanup reaches the browser it launches and nothing else
+                        start_new_session=_HAS_KILLPG,
                     )
                     break
                 except FileNotFoundError:
@@ -362,76 +433,87 @@ Just list restaurant names, one per line."""
                 raise Exception("browser-use command not found")
             
             try:
-                # Wait for completion with timeout
-                stdout, stderr = process.communicate(timeout=self.timeout)
+                # Stream stdout so we can stop as soon as the final result is printed
+                lines = []
+                result_seen = False
+                deadline = time.monotonic() + self.timeout
+                line_queue = queue.Queue()
+                threading.Thread(target=self._pump_lines, args=(process.stdout, line_queue), daemon=True).start()
+                
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        if not result_seen:
+                            print(f"⏱️ CLI timed out after {self.timeout}s")
+                        break
+                    try:
+                        line = line_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        continue
+                    if line is None:  # EOF - process finished
+                        break
+                    lines.append(line)
+                    if not result_seen and line.startswith(b'Result:'):
+                        result_seen = True
+                        # Give a multi-line result a moment to flush, then skip the browser teardown
+                        deadline = min(deadline, time.monotonic() + 2)
                 
+                stdout = b''.join(lines).decode('utf-8', errors='replace')
                 if stdout:
                     return stdout
-                elif stderr and "1." in stderr:  # Check if results are in stderr
-                    print(f"📝 Found results in stderr")
-                    return stderr
-                elif process.returncode != 0:
-                    print(f"❌ CLI Error (code {process.returncode}): {stderr[:500]}")
-                    return ""
-                else:
-                    print(f"⚠️ No output from browser-use")
-                    return ""
-                    
-            except subprocess.TimeoutExpired:
-                print(f"⏱️ CLI timed out after {self.timeout}s")
-                # Kill the process and its children
-                try:
-                    process.terminate()
-                    # Give it a moment to terminate gracefully
-                    process.wait(timeout=2)
-                except:
-                    # Force kill if terminate didn't work
-                    process.kill()
-                
-                # Try to get any output that was produced
-                try:
-                    stdout, stderr = process.communicate(timeout=5)
-                    if stdout:
-                        print(f"📝 Got partial output: {len(stdout)} chars")
-                        return stdout
-                except:
-                    pass
+                print(f"⚠️ No output from browser-use")
                 return ""
             finally:
-                # Ensure process is terminated and cleaned up
-                if process.poll() is None:
-                    try:
-                        process.terminate()
-                        process.wait(timeout=2)
-                    except:
-                        process.kill()
-                
-                # Close any lingering Chromium processes
-                self._cleanup_chromium()
+                # Stop the process and its Chromium; other platforms' browsers may still be running
+                self._kill_process_tree(process)
                 
         except Exception as e:
             print(f"💥 CLI execution failed: {e}")
-            self._cleanup_chromium()
             return ""
     
-    def _cleanup_chromium(self):
-        """Close any lingering Chromium browser windows"""
-        try:
-            # Kill Chromium processes on macOS
-            import platform
-            if platform.system() == "Darwin":  # macOS
-                subprocess.run(["pkill", "-f", "Chromium"], capture_output=True)
-            elif platform.system() == "Linux":
-                subprocess.run(["pkill", "-f", "chromium"], capture_output=True)
+    @staticmethod
+    def _pump_lines(stream, line_queue: queue.Queue):
+        """Forward lines from a pipe into a queue, then None at EOF"""
+        for line in stream:
+            line_queue.put(line)
+        line_queue.put(None)
+    
+    @staticmethod
+    def _kill_process_tree(process: subprocess.Popen):
+        """Terminate a browser-use process and any Chromium left in its process group"""
+        if not _HAS_KILLPG:
             # Note: On Windows, browser-use should handle cleanup
-        except:
-            pass  # Ignore errors in cleanup
+            if process.poll() is None:
+                try:
+                    process.terminate()
+                    process.wait(timeout=2)
+                except:
+                    process.kill()
+            return
+        
+        # The group id is the child's pid (start_new_session); SIGTERM first, then SIGKILL stragglers
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass  # Group already gone
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
     
     def _parse_results(self, raw_output: str, platform: str, context: Any) -> List[ExtractionResult]:
         """Parse CLI output into structured results"""
         
         results = []
         
+        # Context defaults are the same for every row
+        cuisine = self._get_context_cuisine(platform, context)
+        location = self._get_context_location(platform, context)
+        
         # First try pipe-delimited format (Restaurant | Price | Times)
         lines = raw_output.split('\n')
         for line in lines:
@@ -446,7 +528,7 @@ Just list restaurant names, one per line."""
                 parts = [p.strip() for p in line.split('|')]
                 if len(parts) >= 2:
                     name = parts[0]
-                    price = parts[1] if len(parts) > 1 else ''
+                    price = _PRICE_LEVELS.get(parts[1], parts[1])
                     times_str = parts[2] if len(parts) > 2 else ''
                     
                     # Parse times
@@ -457,17 +539,16 @@ Just list restaurant names, one per line."""
                     if name and not name.startswith('[') and len(name) > 3:  # Avoid placeholder text
                         results.append(ExtractionResult(
                             name=name,
-                            cuisine=self._get_context_cuisine(platform, context),
+                            cuisine=cuisine,
                             price_range=price,
-                            location=self._get_context_location(platform, context),
+                            location=location,
                             availability_times=availability
                         ))
         
         # If no pipe format found, try structured format
         if not results:
-            restaurant_blocks = re.findall(r'=== RESTAURANT ===(.+?)=== END ===', raw_output, re.DOTALL)
-            for block in restaurant_blocks:
-                result = self._parse_restaurant_block(block)
+            for data in self._iter_restaurant_blocks(raw_output):
+                result = self._parse_restaurant_block(data)
                 if result:
                     results.append(result)
         
@@ -477,19 +558,37 @@ Just list restaurant names, one per line."""
         
         return results
     
-    def _parse_restaurant_block(self, block: str) -> Optional[ExtractionResult]:
-        """Parse structured restaurant block"""
-        
-        data = {}
-        for line in block.split('\n'):
-            line = line.strip()
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip().lower()
+    @staticmethod
+    def _iter_restaurant_blocks(raw_output: str):
+        """
+        Yield the key/value dict of each === RESTAURANT === ... === END === block
+        in a single pass over the output (unterminated blocks are dropped)
+        """
+        data = None
+        for line in raw_output.splitlines():
+            # Markers may share a line with fields or with each other
+            while True:
+                if data is None:
+                    start = line.find(_BLOCK_START)
+                    if start == -1:
+                        break
+                    data = {}
+                    line = line[start + len(_BLOCK_START):]
+                
+                end = line.find(_BLOCK_END)
+                key, sep, value = (line if end == -1 else line[:end]).partition(':')
                 value = value.strip()
+                if sep and value and value != 'N/A':
+                    data[key.strip().lower()] = value
                 
-                if value and value != 'N/A':
-                    data[key] = value
+                if end == -1:
+                    break
+                yield data
+                data = None
+                line = line[end + len(_BLOCK_END):]
+    
+    def _parse_restaurant_block(self, data: Dict[str, str]) -> Optional[ExtractionResult]:
+        """Build a result from one parsed restaurant block"""
         
         if 'name' not in data:
             return None
@@ -505,7 +604,9 @@ Just list restaurant names, one per line."""
                 availability = []
             elif '[' in times_str and ']' in times_str:
                 # Parse list format [12:15 PM, 12:30 PM, ...]
-                times_content = times_str.split('[')[1].split(']')[0]
+                open_at = times_str.find('[') + 1
+                close_at = times_str.find(']', open_at)
+                times_content = times_str[open_at:close_at] if close_at != -1 else times_str[open_at:]
                 availability = [t.strip() for t in times_content.split(',') if t.strip() and 'PM' in t.upper() or 'AM' in t.upper()]
             else:
                 # Single time or comma-separated times
@@ -514,10 +615,11 @@ Just list restaurant names, one per line."""
                 else:
                     availability = [times_str.strip()] if times_str.strip() else []
         
+        price = data.get('price', '$$')
         return ExtractionResult(
             name=data.get('name', ''),
             cuisine=data.get('cuisine', ''),
-            price_range=data.get('price', '$$'),
+            price_range=_PRICE_LEVELS.get(price, price),
             location=data.get('location', ''),
             availability_times=availability if availability else [],
             raw_data=data
@@ -531,8 +633,8 @@ Just list restaurant names, one per line."""
         
         # Get context-based defaults
         default_cuisine = self._get_context_cuisine(platform, context)
-        default_location = self._get_context_location(platform, context)
-        default_price = self._get_context_price(platform, context)
+        default_location = self._get_context_location(platform, context) or "San Francisco"
+        default_price = self._get_context_price(platform, context) or "$$"
         
         for line in lines:
             line = line.strip()
@@ -558,13 +660,8 @@ Just list restaurant names, one per line."""
                 line.lower() in ['restaurant name', 'price', 'available times', 'example output:']):
                 continue
                 
-            # Check for numbered list format
-            if re.match(r'^\d+\.', line):
-                # Extract restaurant name from numbered list
-                name = re.sub(r'^\d+\.\s*', '', line)
-            else:
-                # Just use the line as the name if it looks like a restaurant
-                name = line
+            # Strip numbered-list prefix; otherwise the line itself is the candidate name
+            name = _NUM_PREFIX_RE.sub('', line, count=1)
             
             # Basic filtering to avoid non-restaurant lines
             if (name and 
@@ -588,8 +685,8 @@ Just list restaurant names, one per line."""
                         results.append(ExtractionResult(
                             name=name,
                             cuisine=default_cuisine,
-                            price_range=default_price or "$$",
-                            location=default_location or "San Francisco",
+                            price_range=default_price,
+                            location=default_location,
                             availability_times=[]
                         ))
         
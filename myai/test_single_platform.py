@@ -7,7 +7,7 @@ import asyncio
 import sys
 from src.myai.preferences import get_user_context
 from src.myai.restaurant_finder import RestaurantFinder
-from browser_use.llm import ChatGoogle
+from src.myai.cli_extractor import get_llm
 from dotenv import load_dotenv
 
 # Load environment
@@ -21,8 +21,7 @@ async def test_platform(platform: str):
     
     # Initialize
     context = get_user_context()
-    llm = ChatGoogle(model='gemini-2.5-flash-lite-preview-06-17')
-    finder = RestaurantFinder(context, llm)
+    finder = RestaurantFinder(context, get_llm())
     
     # Search just this platform
     results = await finder.find_restaurants(
@@ -0,0 +1,46 @@
+"""Restaurant scoring in RestaurantEvaluator"""
+
+import unittest
+
+from myai.evaluator import RestaurantEvaluator, RestaurantInfo
+from myai.preferences import CuisinePreferences, DietaryPreferences, UserContext
+
+
+def _restaurant(*cuisines: str, reviews: str = None) -> RestaurantInfo:
+    return RestaurantInfo(name="Test Kitchen", cuisine_type=list(cuisines), price_range="$$",
+                          address="Nob Hill", reviews_summary=reviews)
+
+
+class CuisineScoreTests(unittest.TestCase):
+
+    def _cuisine_score(self, restaurant: RestaurantInfo, spice_tolerance: str = "hot") -> float:
+        context = UserContext(
+            cuisine=CuisinePreferences(preferred_cuisines=["Asian", "italian"], avoid_cuisines=["french"]),
+            dietary=DietaryPreferences(spice_tolerance=spice_tolerance),
+        )
+        return RestaurantEvaluator(context).evaluate_restaurant(restaurant).cuisine_score
+
+    def test_cuisine_score(self):
+        # cuisines -> score with preferred ["asian", "italian"], avoiding french, no spice limit
+        cases = {
+            ("italian",): 15,
+            ("Italian",): 15,
+            ("thai",): 12,  # asian bonus
+            # A direct preferred match beats the asian bonus, plus 3 for fusion
+            ("thai", "italian"): 18,
+            ("mexican", "greek"): 3,  # fusion bonus only
+            ("italian", "french"): 8,  # 15 + 3 - 10 avoided
+            ("thai", "french"): 5,  # 12 + 3 - 10 avoided
+            ("french",): 0,  # never below zero
+        }
+        for cuisines, score in cases.items():
+            with self.subTest(cuisines=cuisines):
+                self.assertEqual(self._cuisine_score(_restaurant(*cuisines)), score)
+
+    def test_spicy_cuisine_for_mild_palate(self):
+        self.assertEqual(self._cuisine_score(_restaurant("thai"), "mild"), 7)
+        self.assertEqual(self._cuisine_score(_restaurant("thai", reviews="Mild options on request"), "mild"), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Parsing the docstring-style personal context into structured data"""
+
+import unittest
+
+from myai.context_engine import ContextEngine
+
+SAMPLE = """
+# Personal context
+## Dietary Requirements
+- vegetarian: true
+- keto: False
+- dietary_restrictions: ["vegetarian", "keto"]
+
+## Budget & Pricing
+- preferred_price_range: "$"
+- max_spend: 45
+- tip_rate: 0.2
+- version: 1.2.3
+
+## Location Transit
+home_zip: 94109
+notes: near BART, walkable
+"""
+
+
+class PersonalContextParserTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = ContextEngine(SAMPLE).personal_data
+
+    def test_sections(self):
+        self.assertEqual(list(self.data), ["dietary_requirements", "budget___pricing", "location_transit"])
+
+    def test_values(self):
+        # (section, key) -> parsed value
+        cases = {
+            ("dietary_requirements", "vegetarian"): True,
+            ("dietary_requirements", "keto"): False,
+            ("dietary_requirements", "dietary_restrictions"): ["vegetarian", "keto"],
+            ("budget___pricing", "preferred_price_range"): "$",
+            ("budget___pricing", "max_spend"): 45,
+            ("budget___pricing", "tip_rate"): 0.2,
+            # Not a number: stays a string instead of crashing in float()
+            ("budget___pricing", "version"): "1.2.3",
+            ("location_transit", "home_zip"): 94109,
+            ("location_transit", "notes"): "near BART, walkable",
+        }
+        for (section, key), value in cases.items():
+            with self.subTest(section=section, key=key):
+                parsed = self.data[section][key]
+                self.assertEqual(parsed, value)
+                self.assertIs(type(parsed), type(value))
+
+    def test_json_text(self):
+        engine = ContextEngine('{"budget_pricing": {"cheap": true}}')
+        self.assertEqual(engine.personal_data, {"budget_pricing": {"cheap": True}})
+
+
+if __name__ == "__main__":
+    unittest.main()
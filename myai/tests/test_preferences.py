@@ -0,0 +1,32 @@
+"""UserContext immutability and its cached renderings"""
+
+import dataclasses
+import unittest
+
+from myai.preferences import CuisinePreferences, UserContext, format_preferences_for_prompt
+
+
+class UserContextTests(unittest.TestCase):
+
+    def test_preferences_are_frozen(self):
+        context = UserContext()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            context.cuisine = CuisinePreferences()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            context.cuisine.preferred_cuisines = ["thai"]
+
+    def test_replaced_context_renders_fresh(self):
+        context = UserContext()
+        prompt = format_preferences_for_prompt(context)
+        keywords = context.get_search_keywords()
+
+        changed = dataclasses.replace(context, cuisine=CuisinePreferences(preferred_cuisines=["Thai"]))
+        self.assertEqual(changed.cuisine.preferred_cuisines, ["thai"])
+        self.assertNotEqual(format_preferences_for_prompt(changed), prompt)
+        self.assertNotEqual(changed.get_search_keywords(), keywords)
+        # The original's cached renderings are untouched
+        self.assertEqual(format_preferences_for_prompt(context), prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
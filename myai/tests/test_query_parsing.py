@@ -0,0 +1,186 @@
+"""Query parsing: ContextEngine.analyze_request and the date_parser helpers"""
+
+import unittest
+from datetime import date, timedelta
+
+from myai.context_engine import ContextEngine
+from myai.date_parser import get_meal_time, parse_date_query, parse_party_size
+
+
+def _days_ahead(when) -> int:
+    """Whole days from today to a parsed datetime"""
+    return (when.date() - date.today()).days
+
+
+def _next_weekday(weekday: int) -> int:
+    """Days until the next given weekday (Monday=0); today's weekday means a week out"""
+    return (weekday - date.today().weekday()) % 7 or 7
+
+
+class AnalyzeRequestTests(unittest.TestCase):
+    """ContextEngine.analyze_request, the single-scan extractor"""
+
+    # query -> (party_size, meal_type, intent, time)
+    CASES = {
+        "dinner for 4 people": (4, "dinner", "find_restaurants", None),
+        "table for 6": (6, "dinner", "make_reservation", None),
+        "party of 3 for lunch": (3, "lunch", "find_restaurants", None),
+        "5 people tonight": (5, "dinner", "find_restaurants", None),
+        "breakfast and lunch": (2, "breakfast", "find_restaurants", None),
+        "find and book a table": (2, "dinner", "find_restaurants", None),
+        "dinner at 7:30 pm": (2, "dinner", "find_restaurants", "7:30 pm"),
+        "dinner for 2 at 8pm": (2, "dinner", "find_restaurants", "8pm"),
+        # 'table' inside another word is not the reservation keyword
+        "vegetable curry": (2, "dinner", "find_restaurants", None),
+    }
+
+    # query -> days ahead (None when the query names no date)
+    DATES = {
+        "dinner tonight": 0,
+        "lunch today": 0,
+        "brunch tomorrow": 1,
+        "dinner next week": 7,
+        "dinner tuesday": _next_weekday(1),
+        "dinner on tuesdays": None,
+        "dinner for 2": None,
+    }
+
+    def setUp(self):
+        self.engine = ContextEngine()
+
+    def test_fields(self):
+        for query, (party_size, meal_type, intent, time) in self.CASES.items():
+            with self.subTest(query=query):
+                request = self.engine.analyze_request(query)
+                self.assertEqual(request.party_size, party_size)
+                self.assertEqual(request.meal_type, meal_type)
+                self.assertEqual(request.intent, intent)
+                self.assertEqual(request.time, time)
+
+    def test_dates(self):
+        for query, days in self.DATES.items():
+            with self.subTest(query=query):
+                request = self.engine.analyze_request(query)
+                if days is None:
+                    self.assertIsNone(request.date)
+                else:
+                    self.assertEqual(_days_ahead(request.date), days)
+
+    def test_keeps_original_query(self):
+        request = self.engine.analyze_request("  Dinner for 2 ")
+        self.assertEqual(request.original_query, "  Dinner for 2 ")
+        self.assertEqual(request.party_size, 2)
+
+    def test_results_are_independent(self):
+        first = self.engine.analyze_request("cheap dinner for 2")
+        first.context_relevance["budget"] = -1.0
+        first.budget_context["injected"] = True
+        second = self.engine.analyze_request("cheap dinner for 2")
+        self.assertGreater(second.context_relevance["budget"], 0)
+        self.assertNotIn("injected", second.budget_context)
+
+
+class ParsePartySizeTests(unittest.TestCase):
+
+    CASES = {
+        "dinner for 5 at 8pm tuesday": 5,
+        "for 5 people": 5,
+        "5 people": 5,
+        "party of 5": 5,
+        "table for 5": 5,
+        "dinner for five people": 5,
+        "lunch for one": 1,
+        "dinner near union square for 6": 6,
+        # 'one' inside another word is not a number
+        "dinner for someone": 2,
+        "dinner": 2,
+    }
+
+    def test_party_size(self):
+        for query, size in self.CASES.items():
+            with self.subTest(query=query):
+                self.assertEqual(parse_party_size(query), size)
+
+
+class GetMealTimeTests(unittest.TestCase):
+
+    CASES = {
+        "dinner at 7:30 pm": "7:30 PM",
+        "dinner for 2 at 7:30pm friday": "7:30 PM",
+        "dinner at 8pm": "8:00 PM",
+        "breakfast": "10:00 AM",
+        "brunch and dinner": "10:00 AM",
+        "lunch tonight": "12:30 PM",
+        "dinner": "7:00 PM",
+        "somewhere nice": "7:00 PM",
+    }
+
+    def test_meal_time(self):
+        for query, meal_time in self.CASES.items():
+            with self.subTest(query=query):
+                self.assertEqual(get_meal_time(query), meal_time)
+
+
+class ParseDateQueryTests(unittest.TestCase):
+
+    # query -> days ahead
+    CASES = {
+        "dinner tonight": 0,
+        "lunch tomorrow": 1,
+        "lunch day after tomorrow": 2,
+        "dinner next week": 7,
+        "dinner this weekend": _next_weekday(5),
+        "dinner tuesday": _next_weekday(1),
+        # Only whole weekday names count
+        "dinner on tuesdays": 0,
+        # The first weekday named wins
+        "friday or monday": _next_weekday(4),
+        "dinner": 0,
+    }
+
+    def test_days_ahead(self):
+        for query, days in self.CASES.items():
+            with self.subTest(query=query):
+                self.assertEqual(_days_ahead(parse_date_query(query).date), days)
+
+    def test_labels(self):
+        self.assertEqual(parse_date_query("dinner tonight").label, "Today")
+        self.assertEqual(parse_date_query("lunch tomorrow").label, "Tomorrow")
+        expected = (date.today() + timedelta(days=2)).strftime("%A, %B %d")
+        self.assertEqual(parse_date_query("day after tomorrow").label, expected)
+
+    def test_unpacks_as_pair(self):
+        when, label = parse_date_query("dinner tonight")
+        self.assertEqual(label, "Today")
+
+
+class InflectedKeywordTests(unittest.TestCase):
+    """Meal and intent words still count when pluralized or inflected"""
+
+    # query -> (intent, meal_type, meal time)
+    CASES = {
+        "booking for 4 tonight": ("make_reservation", "dinner", "7:00 PM"),
+        "booking lunches for 3": ("make_reservation", "lunch", "12:30 PM"),
+        "booked a table": ("make_reservation", "dinner", "7:00 PM"),
+        "reserved for 2": ("make_reservation", "dinner", "7:00 PM"),
+        "dinners for 2": ("find_restaurants", "dinner", "7:00 PM"),
+        "brunches this weekend": ("find_restaurants", "breakfast", "10:00 AM"),
+        "searching breakfasts": ("find_restaurants", "breakfast", "10:00 AM"),
+        # Longer words that merely start with a keyword are not keywords
+        "brunchtime tablespoon": ("find_restaurants", "dinner", "7:00 PM"),
+    }
+
+    def setUp(self):
+        self.engine = ContextEngine()
+
+    def test_inflected_keywords(self):
+        for query, (intent, meal_type, meal_time) in self.CASES.items():
+            with self.subTest(query=query):
+                request = self.engine.analyze_request(query)
+                self.assertEqual(request.intent, intent)
+                self.assertEqual(request.meal_type, meal_type)
+                self.assertEqual(get_meal_time(query), meal_time)
+
+
+if __name__ == "__main__":
+    unittest.main()